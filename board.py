@@ -65,6 +65,9 @@ dass der Magnetschalter nicht triggert.
 Aus diesem Grund musst die ursprüngliche Implementierung (Interrupt an fallender Flanke)
 verwerfen und ein Intervall-Polling verwenden (siehe :meth:`Board.IsReedClosed`)
 sowie die Dauer der Bewegung prüfen.
+Die fallende Flanke wird nur noch genutzt, um das Warten zwischen den Messungen vorzeitig
+zu beenden (siehe :meth:`Board._WaitForReedEdge`), die Entscheidung fällt weiterhin über
+die Messreihe.
 
 Um nach einem Neustart den letzten Zustand auch ohne Magnetkontakte zu erhalten, wird
 der jeweils aktuelle Zustand der Tür in einer Datei gespeichert, die bei Neustart
@@ -106,7 +109,8 @@ Als Pullup mit 10K an :data:`config.SHUTDOWN_BUTTON` (Pin #29) verbundener Taste
 Ursprünglich nur als Shutdown-Variante mit Interrupt an steigender Flanke (Loslassen)
 verbunden, gab es auch hier ab und an Fehlmeldung (entweder auch durch Interferenzen oder
 Fehler in der GPIO-Bibliothek), so dass ich hier :meth:`Board.OnShutdownButtonPressed`
-als Interrupt für beide Flanken verwenden und die Zeit dazwischen messe, um einen
+als Interrupt für die fallende Flanke (Drücken) verwende und darin messe, wie lange der
+Taster gedrückt bleibt, um einen
 Reboot (> :data:`config.BTN_DURATION_REBOOT` Sekunden drücken) oder
 Shutdown (> :data:`config.BTN_DURATION_SHUTDOWN` Sekunden drücken) auszulösen.
 
@@ -117,12 +121,42 @@ Klassen und Funktionen
 # --------------------------------------------------------------------------------------------------
 import os
 import time
+import atexit
 import json
+import queue
+import logging
+import statistics
+import subprocess
+import threading
 # --------------------------------------------------------------------------------------------------
-from shared import LoggableClass, resource_path
+from shared import LoggableClass, getLogger, resource_path
 from gpio import GPIO, SMBus
 from config import * # pylint: disable=W0614
 # --------------------------------------------------------------------------------------------------
+try:
+    from orjson import dumps as _JsonDumps
+except ImportError:
+    def _JsonDumps(data)->bytes:
+        """
+        Ersatz für ``orjson.dumps`` falls ``orjson`` nicht verfügbar ist.
+        Liefert ``data`` wie dieses als kompakt (ohne Leerzeichen) JSON-kodierte Bytes.
+        """
+        return json.dumps(data, separators = (',', ':')).encode('utf-8')
+# --------------------------------------------------------------------------------------------------
+#: Kommando für den Shutdown in :meth:`Board.OnShutdownButtonPressed`
+#: (``sudo -n``, damit nie interaktiv nach einem Passwort gefragt wird).
+_SHUTDOWN_CMD = ("sudo", "-n", "shutdown", "-h", "now")
+#: Kommando für den Reboot in :meth:`Board.OnShutdownButtonPressed`.
+_REBOOT_CMD = ("sudo", "-n", "reboot", "-h", "now")
+#: Bezeichnung eines Schaltzustands für die Logausgaben, als Index dient der Zustand.
+_ONOFF = ("off", "on")
+#: Relais-Pegel für einen Schaltzustand, als Index dient der Zustand.
+_RELAIS = (RELAIS_OFF, RELAIS_ON)
+# --------------------------------------------------------------------------------------------------
+_NOMINAL_TEMP = 298.15      #: Nenntemperatur des Thermistor (Datenblatt, in Kelvin)
+_MATERIAL_CONSTANT = 1100.0 #: Materialkonstante des Thermistor aus dem Datenblatt
+_CALIBRATION_VALUE = 127.0  #: ausgelesener Wert bei Nennemperatur (:data:`_NOMINAL_TEMP`)
+# --------------------------------------------------------------------------------------------------
 def AnalogToCelsius(analog_value):
     """
     Rechnet den vom Thermistor des PCF8591 gelieferten Analogwert in Grad Celsius um.
@@ -130,17 +164,39 @@ def AnalogToCelsius(analog_value):
     da der Sensor nicht funktioniert.
     """
     return float(analog_value)
-    # nominal_temp = 298.15      # Nenntemperatur des Thermistor (Datenblatt, in Kelvin)
-    # material_constant = 1100.0 # Materialkonstante des Thermistor aus dem Datenblatt
-    # calibration_value = 127.0  # ausgelesener Wert bei Nennemperatur (nominal_temp)
-    # temp = 1.0 / (1.0 / nominal_temp + 1.0
-    #               / material_constant * math.log(analog_value / calibration_value))
+    # temp = 1.0 / (1.0 / _NOMINAL_TEMP + 1.0
+    #               / _MATERIAL_CONSTANT * math.log(analog_value / _CALIBRATION_VALUE))
     # return temp - 273.15
 # --------------------------------------------------------------------------------------------------
+def _BuildCelsiusTable()->tuple:
+    """
+    Berechnet für alle 256 möglichen Analogwerte des PCF8591 einmalig die Temperatur
+    über :func:`AnalogToCelsius`. Werte ausserhalb des Bereichs ergeben -100.0.
+    Die lineare Korrektur aus :data:`config.TEMP_CORRECTION_GAIN` und
+    :data:`config.TEMP_CORRECTION_OFFSET` ist bereits eingerechnet. Ist die Steigung 0
+    (bzw. nicht gesetzt), wird ein Fehler geloggt und stattdessen 1.0 verwendet.
+    """
+    gain = TEMP_CORRECTION_GAIN
+    if not gain:
+        getLogger("Sensors").error("Invalid TEMP_CORRECTION_GAIN %r, using 1.0.", gain)
+        gain = 1.0
+    table = []
+    for analog_value in range(256):
+        try:
+            temp = AnalogToCelsius(analog_value)
+            table.append((temp - TEMP_CORRECTION_OFFSET) / gain)
+        except ValueError:
+            table.append(-100.0)
+    return tuple(table)
+# --------------------------------------------------------------------------------------------------
 class Sensors(LoggableClass):
     """
     Diese Klasse dient zum Auslesen des Multisensors PCF8591 an I2C #0
     auf PIN #3 (SDA) und PIN #4 (SCL).
+
+    Der PCF8591 unterstützt einen Bustakt von 100 kHz, der in der ``/boot/config.txt``
+    über ``dtparam=i2c_arm_baudrate=100000`` eingestellt werden sollte. Beim ersten Zugriff
+    auf den Bus wird der tatsächliche Takt geprüft (siehe :meth:`_CheckBusClock`).
     """
 
     SMBUS_ADDR = 0x48       #: Adresse des I2C-Device
@@ -151,60 +207,224 @@ class Sensors(LoggableClass):
     SMBUS_CH_POTI = 0x43    #: Potentiometer-Kanal
     SMBUS_CH_AOUT = 0x44    #: AOUT
 
-    def __init__(self):
+    #: Kanäle, die über :meth:`ReadChannel` gelesen werden können.
+    _VALID_CHANNELS = frozenset((SMBUS_CH_LIGHT, SMBUS_CH_AIN, SMBUS_CH_TEMP, SMBUS_CH_POTI))
+
+    #: Anzahl der zuerst gelesenen Werte in :meth:`ReadChannel`. Weichen diese um
+    #: höchstens :attr:`STABLE_SPREAD` voneinander ab, wird nicht weiter gelesen.
+    STABLE_SAMPLES = 3
+    #: Maximale Abweichung der ersten Werte, die noch als stabil gilt.
+    STABLE_SPREAD = 1
+
+    #: Temperatur in °C je Analogwert, siehe :func:`_BuildCelsiusTable`.
+    CELSIUS_TABLE = _BuildCelsiusTable()
+
+    #: Mindest-Taktfrequenz des I2C-Busses in Hz (Standard-Mode des PCF8591).
+    I2C_MIN_CLOCK = 100000
+    #: Device-Tree-Eintrag mit der konfigurierten Taktfrequenz des I2C-Busses #1
+    #: (als 32-Bit Big-Endian Wert, über ``dtparam=i2c_arm_baudrate`` einstellbar).
+    I2C_CLOCK_FILE = "/sys/class/i2c-adapter/i2c-1/of_node/clock-frequency"
+
+    #: Gemeinsam genutzte Instanz von ``SMBus(1)``, wird erst bei Bedarf von
+    #: :meth:`_GetBus` geöffnet (siehe dort).
+    _shared_bus = None
+
+    #: Lock zur Serialisierung der Zugriffe auf den I2C-Bus, da die Sensoren
+    #: aus verschiedenen Threads (z.Bsp. XMLRPC-Requests und JobTimer) gelesen werden.
+    #: Gilt für alle Instanzen, die sich den Bus teilen. Reentrant, damit :meth:`ReadAll`
+    #: den Bus über mehrere Kanäle hinweg halten kann.
+    _bus_lock = threading.RLock()
+
+    def __init__(self, bus = None, cache_ttl:float = SENSOR_CACHE_TTL):
+        """
+        :param bus: der zu verwendende I2C-Bus. Ohne Angabe wird der gemeinsam
+            genutzte Bus aus :meth:`_GetBus` verwendet, dieser wird aber erst beim
+            ersten Zugriff über :attr:`bus` geöffnet.
+        :param float cache_ttl: Dauer in Sekunden, für die ein gelesener Wert
+            wiederverwendet wird (siehe :meth:`ReadChannel`).
+        """
         LoggableClass.__init__(self, name = "Sensors")
-        self._bus = SMBus(1)
+        self._bus = bus
+
+        #: Dauer in Sekunden, für die ein Messwert im :attr:`_sensor_cache` gültig ist.
+        self.cache_ttl = cache_ttl
+
+        #: Zuletzt gemessene Werte je Kanal und Anzahl (``(channel, count)``) als Tupel
+        #: aus Zeitpunkt (``time.monotonic``) und Median.
+        self._sensor_cache = {}
+
+        #: Ob :meth:`_CheckBusClock` schon gelaufen ist (beim ersten Zugriff auf :attr:`bus`).
+        self._bus_clock_checked = False
+
+    def _CheckBusClock(self):
+        """
+        Schreibt die konfigurierte Taktfrequenz des I2C-Busses ins Log und warnt, wenn
+        diese unter :attr:`I2C_MIN_CLOCK` liegt, da die Messungen in :meth:`ReadChannel`
+        im Wesentlichen durch den Bus begrenzt sind.
+        Ist die Frequenz nicht auslesbar (z.Bsp. ohne Device-Tree), erfolgt keine Prüfung.
+        """
+        try:
+            with open(self.I2C_CLOCK_FILE, 'rb') as f:
+                clock = int.from_bytes(f.read(4), 'big')
+        except (OSError, ValueError):
+            self.debug("I2C clock frequency not available.")
+            return
+        if clock < self.I2C_MIN_CLOCK:
+            self.warning(
+                "I2C clock frequency is %d Hz, expected at least %d Hz "
+                "(see dtparam=i2c_arm_baudrate).", clock, self.I2C_MIN_CLOCK)
+        else:
+            self.info("I2C clock frequency is %d Hz.", clock)
+
+    @property
+    def bus(self):
+        """
+        Der verwendete I2C-Bus: der bei der Erzeugung übergebene oder der gemeinsam genutzte
+        Bus aus :meth:`_GetBus`. Letzterer wird erst beim ersten Zugriff geöffnet, so dass
+        ohne Messung auch kein Zugriff auf ``/dev/i2c-1`` erfolgt. Er wird nicht in der
+        Instanz gespeichert, damit nach :meth:`CleanUp` keine Instanz den geschlossenen Bus
+        weiterverwendet.
+
+        Beim ersten Zugriff wird außerdem die Taktfrequenz über :meth:`_CheckBusClock`
+        geprüft.
+        """
+        if not self._bus_clock_checked:
+            self._bus_clock_checked = True
+            self._CheckBusClock()
+        if self._bus is not None:
+            return self._bus
+        return self._GetBus()
+
+    @classmethod
+    def _GetBus(cls):
+        """
+        Liefert den gemeinsam genutzten I2C-Bus und öffnet ihn beim ersten Aufruf.
+        So wird ``/dev/i2c-1`` nur einmal geöffnet, auch wenn weitere Verbraucher
+        des Busses hinzukommen.
+        """
+        with cls._bus_lock:
+            if cls._shared_bus is None:
+                cls._shared_bus = SMBus(1)
+            return cls._shared_bus
 
     def ReadChannel(self, channel:int, count:int = 10)->int:
         """
         Liest vom Kanal 'channel' Werte in der Anzahl 'count',
         bildet aus diesen den Median und liefert ihn zurück.
-        Wenn kein Wert ermittelt werden konnte, wird stattdessen
+        Wenn kein Wert ermittelt werden konnte oder ``channel`` kein lesbarer
+        Kanal ist (siehe :attr:`_VALID_CHANNELS`), wird stattdessen
         None zurückgegeben.
+
+        Die Werte werden in einer einzigen I2C-Transaktion als Block gelesen
+        (Kanal addressieren, dann ``count + 1`` Bytes lesen). Da der PCF8591
+        mit jedem Lesen die vorherige Wandlung liefert, wird das erste Byte verworfen.
+        Parallele Aufrufe aus verschiedenen Threads werden über :attr:`_bus_lock`
+        serialisiert.
+
+        Dabei werden zuerst nur :attr:`STABLE_SAMPLES` Werte gelesen. Liegen diese
+        höchstens :attr:`STABLE_SPREAD` auseinander, ist der Wert stabil und es wird
+        direkt deren Median geliefert. Erst sonst werden die restlichen Werte in einem
+        zweiten Block gelesen (ohne Verwerfen, da der Kanal unverändert bleibt).
+
+        Liegt die letzte erfolgreiche Messung des Kanals mit derselben Anzahl ``count``
+        weniger als :attr:`cache_ttl` Sekunden zurück, wird deren Ergebnis ohne erneuten
+        Buszugriff geliefert.
         """
+        if channel not in self._VALID_CHANNELS:
+            self.error("Invalid channel %d.", channel)
+            return None
+        cache_key = (channel, count)
+        cached = self._sensor_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+        head = min(count, self.STABLE_SAMPLES)
+        expected = count
         values = []
-        for _ in range(count):
-            try:
-                # als erstes den Kanal addressieren
-                self._bus.write_byte(self.SMBUS_ADDR, channel)
-                # dann dessen Wert auslesen
-                values.append(self._bus.read_byte(self.SMBUS_ADDR))
-            except Exception:
-                continue
+        try:
+            with self._bus_lock:
+                # erst hier holen, damit ein CleanUp nicht zwischen Holen und Lesen fällt
+                bus = self.bus
+                try:
+                    values = bus.read_i2c_block_data(self.SMBUS_ADDR, channel, head + 1)[1:]
+                    if len(values) == head and max(values) - min(values) <= self.STABLE_SPREAD:
+                        # stabiler Wert, der Rest kann entfallen
+                        expected = head
+                    elif count > head:
+                        values += bus.read_i2c_block_data(self.SMBUS_ADDR, channel, count - head)
+                except OSError:
+                    # z.Bsp. bei Übertragungsfehlern oder Adaptern ohne Block-Transfer
+                    self.warning(
+                        "Block read failed at channel %d, reading single bytes.", channel)
+                    expected = count
+                    values = self._ReadBytes(bus, channel, count)
+        except Exception:
+            self.exception("Error while reading from channel %d.", channel)
+            return None
         if not values:
             self.error("Failed to read from channel %d.", channel)
             return None
 
         read_values = len(values)
-        if read_values < count:
+        if read_values < expected:
             self.warn(
                 "Missed some values at channel %d, expected %d, got only %d.",
-                channel, count, read_values)
+                channel, expected, read_values)
+
+        # Median bilden (bei gerader Anzahl der obere der beiden mittleren Werte):
+        median = statistics.median_high(values)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.debug(
+                "Measured %d values in %d attempts at channel %d, median is %d.",
+                read_values, count, channel, median)
+        # Zeitpunkt erst nach dem Lesen, das Warten auf den Bus zählt nicht zur Gültigkeit
+        self._sensor_cache[cache_key] = (time.monotonic(), median)
+        return median
 
-        # Median bilden:
+    def _ReadBytes(self, bus, channel:int, count:int)->list:
+        """
+        Ersatz für den Block-Transfer in :meth:`ReadChannel`: adressiert den Kanal
+        ``channel`` einmal und liest dann ``count`` Werte einzeln. Auch hier wird der
+        erste (veraltete) Wert verworfen, fehlgeschlagene Lesezugriffe werden übersprungen.
 
-        values.sort()
-        median = values[read_values // 2]
-        self.debug(
-            "Measured %d values in %d attempts at channel %d, median is %d.",
-            read_values, count, channel, median)
-        return median
+        :returns: Liste der gelesenen Werte (ggf. leer).
+        """
+        values = []
+        addr = self.SMBUS_ADDR
+        append = values.append
+        read_byte = bus.read_byte
+        with self._bus_lock:
+            try:
+                bus.write_byte(addr, channel)
+                read_byte(addr)
+            except OSError:
+                self.warning("Failed to select channel %d.", channel)
+                return values
+            for _ in range(count):
+                try:
+                    append(read_byte(addr))
+                except OSError:
+                    # Übertragungsfehler, fehlende Werte meldet ReadChannel
+                    pass
+        return values
 
     def ReadTemperature(self)->float:
         """
         Liest den Widerstandswert des Thermistor aus dem entsprechenden Kanal
         und liefert à conto dessen die Temperatur in °C zurück.
+        Die Umrechnung erfolgt über die vorberechnete :attr:`CELSIUS_TABLE`.
 
         :see:
             :meth:`ReadChannel`
         """
-        self.debug("Reading temperature.")
+        # die Messungen laufen regelmäßig, also nur loggen, wenn DEBUG auch aktiv ist
+        log_debug = self.logger.isEnabledFor(logging.DEBUG)
+        if log_debug:
+            self.debug("Reading temperature.")
         analog_value = self.ReadChannel(self.SMBUS_CH_TEMP)
-        try:
-            t = AnalogToCelsius(analog_value)
-        except ValueError: # Wert ausserhalb des Bereichs
-            t = -100.0
-        self.debug("Read a temperatur of %.2f°C.", t)
+        # nicht messbar ergibt wie ein Wert ausserhalb des Bereichs -100.0
+        t = -100.0 if analog_value is None else self.CELSIUS_TABLE[analog_value]
+        if log_debug:
+            self.debug("Read a temperatur of %.2f°C.", t)
         return t
 
     def ReadLight(self)->int:
@@ -215,20 +435,76 @@ class Sensors(LoggableClass):
         :see:
             :meth:`ReadChannel`
         """
-        self.debug("Reading light sensor.")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.debug("Reading light sensor.")
         return self.ReadChannel(self.SMBUS_CH_LIGHT)
 
+    def ReadAll(self)->dict:
+        """
+        Liest Temperatur und Helligkeit in einem Zug, ohne dass sich zwischen den
+        beiden Kanälen ein anderer Thread auf den Bus drängen kann.
+
+        :returns: Ein Dictionary mit den Werten ``temperature`` (siehe
+            :meth:`ReadTemperature`) und ``light`` (siehe :meth:`ReadLight`).
+        """
+        with self._bus_lock:
+            return {
+                "temperature": self.ReadTemperature(),
+                "light": self.ReadLight(),
+            }
+
     def CleanUp(self):
         """
         Räumt die verwendeten Ressourcen auf.
+        Geschlossen wird der bei der Erzeugung übergebene Bus oder sonst der gemeinsam
+        genutzte Bus, dieser wird beim nächsten Zugriff über :attr:`bus` (auch aus anderen
+        Instanzen) neu geöffnet.
         """
-        self._bus.close()
+        with self._bus_lock:
+            if self._bus is not None:
+                bus, self._bus = self._bus, None
+            else:
+                bus, Sensors._shared_bus = Sensors._shared_bus, None
+            if bus is not None:
+                bus.close()
 # --------------------------------------------------------------------------------------------------
 class Board(LoggableClass):
     """
     Bildet die wesentliche Steuerung am Board ab.
     """
 
+    #: Flags für das Schreiben der Zustandsdatei in :meth:`Save`.
+    _SAVE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_DSYNC', 0)
+
+    #: Ausgangswerte, um alle Relais (:data:`config.RELAIS_PINS`) mit einem
+    #: einzigen ``GPIO.output``-Aufruf abzuschalten.
+    _ALL_RELAIS_OFF = [RELAIS_OFF] * len(RELAIS_PINS)
+
+    #: Türzustand für :meth:`GetState` je Wert von :attr:`door_state` (als Index).
+    #: ``None`` bedeutet, dass der Zustand anhand der Magnetkontakte ermittelt wird
+    #: (siehe :attr:`_DOOR_BY_REEDS`).
+    _DOOR_BY_STATE = tuple(
+        DOOR_MOVING if state & DOOR_MOVING else
+        state if state in (DOOR_OPEN, DOOR_CLOSED) else None
+        for state in range(16))
+
+    #: Türzustand für :meth:`GetState` je Kombination der Magnetkontakte, der Index
+    #: ergibt sich aus ``(unten geschlossen << 1) | oben geschlossen``. Sind beide
+    #: oder keiner geschlossen, ist der Zustand unbekannt.
+    _DOOR_BY_REEDS = (DOOR_NOT_MOVING, DOOR_OPEN, DOOR_CLOSED, DOOR_NOT_MOVING)
+
+    #: Magnetkontakt, der eine gespeicherte Endposition der Tür in :meth:`GetState` bestätigt.
+    _END_REED = {DOOR_OPEN: REED_UPPER, DOOR_CLOSED: REED_LOWER}
+
+    #: Parameter einer Türbewegung je Richtung, als Index dient ``direction == MOVE_UP``.
+    #: Jeder Eintrag besteht aus: Bezeichnung der Richtung, Pin des Magnetkontakts,
+    #: Türzustand während und nach der Bewegung, maximale Bewegungszeit und
+    #: Nachlaufzeit nach Auslösen des Magnetkontakts.
+    _MOVE_PARAMS = (
+        ("down", REED_LOWER, DOOR_MOVING_DOWN, DOOR_CLOSED, DOOR_MOVE_DOWN_TIME, LOWER_REED_OFFSET),
+        ("up", REED_UPPER, DOOR_MOVING_UP, DOOR_OPEN, DOOR_MOVE_UP_TIME, UPPER_REED_OFFSET),
+    )
+
     def __init__(self):
         LoggableClass.__init__(self, name = "Board")
 
@@ -266,11 +542,6 @@ class Board(LoggableClass):
         #:   :attr:`light_state_indoor`
         self.light_state_outdoor = False
 
-        #: Zeitpunkt, an dem der Shutdown-Button gedrückt wurde.
-        #: Wird in :meth:`OnShutdownButtonPressed` benutzt um zu ermitteln, wie lange der Knopf
-        #: gedrückt wurde (und Fehlsignalisierung auszuschließen)
-        self.shutdown_btn_time = 0
-
         #: Referenz auf ein Callable, welches bei Änderung des Board-Status
         #: gerufen wird.
         #:
@@ -279,6 +550,13 @@ class Board(LoggableClass):
         #:    :meth:`SetStateChangeHandler`
         self.state_change_handler = None
 
+        #: Laufender ``threading.Timer``, der nach :data:`config.STATE_COALESCE_TIME`
+        #: Sekunden :meth:`_NotifyStateChange` ruft, oder ``None``.
+        self._pending_timer = None
+
+        #: Lock zum Schutz von :attr:`_pending_timer`.
+        self._timer_lock = threading.Lock()
+
         #: Pfad der Datei, in der der Status gespeichert wird.
         #:
         #: .. seealso::
@@ -286,6 +564,47 @@ class Board(LoggableClass):
         #:   :meth:`Save`
         self.state_file = resource_path.joinpath(BOARDFILE)
 
+        #: Der zuletzt in :attr:`state_file` geschriebene (oder daraus geladene)
+        #: :attr:`door_state`. ``None`` solange die Datei weder gelesen noch geschrieben wurde.
+        #:
+        #: .. seealso::
+        #:   :meth:`Save`
+        self._saved_door_state = None
+
+        #: Zwischenspeicher für die Messergebnisse der Magnetkontakte. Bildet den
+        #: Pin auf ein Tuple aus Messzeitpunkt (``time.monotonic()``) und Ergebnis ab.
+        #: Wird bei jedem Start / Stop des Motors geleert.
+        #:
+        #: .. seealso::
+        #:   :meth:`IsReedClosed`
+        self._reed_cache = {}
+
+        #: Zuletzt von :meth:`GetState` ermittelter Status als Tupel aus Zeitpunkt
+        #: (``time.monotonic``), Schlüssel aus Tür- und Lichtzuständen und Dictionary.
+        self._state_cache = None
+
+        #: Warteschlange mit dem zuletzt noch nicht geschriebenen Zustand für
+        #: :meth:`_WriteStates` (es wird immer nur der neueste Zustand gehalten).
+        self._save_queue = queue.Queue(maxsize = 1)
+
+        #: Thread, der die Zustandsdatei schreibt (wird von :meth:`Save` bei Bedarf gestartet).
+        self._save_thread = None
+
+        #: Lock, damit :meth:`_WriteState` nicht gleichzeitig aus dem Writer-Thread und
+        #: :meth:`FlushStateChanges` schreibt.
+        self._write_lock = threading.Lock()
+
+        #: Wird von :meth:`StopDoor` gesetzt, um eine laufende Bewegung in
+        #: :meth:`SyncMoveDoor` abzubrechen.
+        self._stop_event = threading.Event()
+
+        #: Lock um :meth:`StopMotor`, damit ein Abbruch durch :meth:`StopDoor` nicht vom
+        #: Erreichen der Endposition in :meth:`SyncMoveDoor` überschrieben wird.
+        self._motor_lock = threading.RLock()
+
+        #: Thread von :meth:`_WatchShutdownButton`, solange der Taster überwacht wird.
+        self._button_thread = None
+
         GPIO.setmode(GPIO.BOARD)
 
         self.logger.debug("Settings pins %s to OUT.", OUTPUT_PINS)
@@ -295,17 +614,38 @@ class Board(LoggableClass):
         GPIO.setup(INPUT_PINS, GPIO.IN)
 
         GPIO.add_event_detect(
-            SHUTDOWN_BUTTON, GPIO.BOTH,
+            SHUTDOWN_BUTTON, GPIO.FALLING,
             self.OnShutdownButtonPressed, bouncetime = 200)
 
         #: Instanz von :class:`Sensors` zum Auslesen der Temperatur
         #: und Helligkeitswerte.
         self.sensor = Sensors()
 
+        #: Ob :meth:`close` bereits gerufen wurde.
+        self._closed = False
+        atexit.register(self.close)
+
         self.CheckInitialState()
     # -----------------------------------------------------------------------------------
-    def __del__(self):
-        GPIO.cleanup()
+    def close(self):
+        """
+        Erledigt noch ausstehende Statusänderungen (:meth:`FlushStateChanges`),
+        schaltet alle Relais ab und gibt GPIO und I2C-Bus frei.
+        Wird beim Beenden des Interpreters automatisch über ``atexit`` gerufen,
+        mehrfaches Aufrufen ist unschädlich.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self.FlushStateChanges()
+        try:
+            # alle Relais in einem Aufruf abschalten, bevor die Pins freigegeben werden
+            GPIO.output(list(RELAIS_PINS), self._ALL_RELAIS_OFF)
+            GPIO.cleanup()
+            self.sensor.CleanUp()
+        except Exception:
+            self.exception("Error while closing board.")
     # -----------------------------------------------------------------------------------
     def CheckInitialState(self):
         """
@@ -345,19 +685,96 @@ class Board(LoggableClass):
             - :attr:`light_state_indoor`
             - :attr:`light_state_outdoor`
 
-        die im JSON-Format gespeichert werden.
+        die im JSON-Format gespeichert werden (über ``orjson``, falls installiert).
+
+        Da :meth:`Load` nur den :attr:`door_state` wiederherstellt, wird die Datei
+        nur dann neu geschrieben, wenn sich dieser seit dem letzten Schreiben (bzw. Laden)
+        geändert hat (siehe :attr:`_saved_door_state`). Das schont die SD-Karte, reine
+        Lichtschaltungen führen also zu keinem Schreibzugriff. Gleiches gilt für die
+        vorübergehenden Zustände während einer Türbewegung (:data:`config.DOOR_MOVING`),
+        gespeichert wird erst der damit erreichte Endzustand.
+
+        Geschrieben wird nicht hier, sondern im Hintergrund von :meth:`_WriteStates`, so
+        dass z.Bsp. das Stoppen des Motors nicht auf die SD-Karte warten muss. Liegt dort
+        noch ein nicht geschriebener Zustand, wird dieser durch den aktuellen ersetzt.
+
+        :returns: ``True`` wenn der Zustand zum Schreiben übergeben wurde
+            oder bereits gespeichert ist.
 
         .. seealso::
             :meth:`Load`
             :meth:`CallStateChangeHandler`
         """
+        if self.door_state == self._saved_door_state or self.door_state & DOOR_MOVING:
+            return True
+        data = _JsonDumps({
+            'door_state': self.door_state,
+            'light_state_indoor': self.light_state_indoor,
+            'light_state_outdoor': self.light_state_outdoor,
+        })
+        self._saved_door_state = self.door_state
+        if self._save_thread is None:
+            self._save_thread = threading.Thread(
+                target = self._WriteStates, name = "StateWriter", daemon = True)
+            self._save_thread.start()
+        # nur der neueste Zustand ist relevant, also einen noch
+        # nicht geschriebenen verwerfen
         try:
-            with self.state_file.open('w') as f:
-                json.dump({
-                    'door_state': self.door_state,
-                    'light_state_indoor': self.light_state_indoor,
-                    'light_state_outdoor': self.light_state_outdoor,
-                }, f)
+            self._save_queue.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            # für FlushStateChanges als erledigt markieren (siehe queue.Queue.join)
+            self._save_queue.task_done()
+        try:
+            self._save_queue.put_nowait(data)
+        except queue.Full:
+            # der Writer war schneller und hat einen dazwischen gekommenen
+            # Zustand noch nicht geholt, beim nächsten Speichern nochmal
+            self._saved_door_state = None
+            return False
+        return True
+
+    def _WriteStates(self):
+        """
+        Thread-Funktion, die die von :meth:`Save` übergebenen Zustände
+        mittels :meth:`_WriteState` in die Datei schreibt.
+        """
+        while True:
+            data = self._save_queue.get()
+            try:
+                if not self._WriteState(data):
+                    # beim nächsten Speichern erneut versuchen
+                    self._saved_door_state = None
+            finally:
+                self._save_queue.task_done()
+
+    def _WriteState(self, data:bytes)->bool:
+        """
+        Schreibt ``data`` in die Datei :attr:`state_file`.
+
+        Geschrieben wird ungepuffert mit ``O_DSYNC`` in eine temporäre Datei, die
+        anschließend atomar über die Zustandsdatei verschoben wird.
+
+        :returns: Ob die Datei geschrieben wurde.
+        """
+        tmp_file = str(self.state_file) + '.tmp'
+        with self._write_lock:
+            return self._WriteStateFile(tmp_file, data)
+
+    def _WriteStateFile(self, tmp_file:str, data:bytes)->bool:
+        """
+        Führt das eigentliche Schreiben für :meth:`_WriteState` aus.
+        """
+        try:
+            # Erst in eine temporäre Datei schreiben und diese dann umbenennen, damit
+            # bei einem Stromausfall nie eine halb geschriebene Zustandsdatei übrig bleibt.
+            fd = os.open(tmp_file, self._SAVE_FLAGS, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, str(self.state_file))
         except Exception:
             self.exception("Error while saving state file.")
             return False
@@ -385,6 +802,7 @@ class Board(LoggableClass):
         # wir laden nur den Türstatus, da die Lichtrelais immer aus sind,
         # wenn neu gestartet wurde.
         self.door_state = data.get('door_state', DOOR_NOT_MOVING)
+        self._saved_door_state = self.door_state
 
         self.info("Loaded state: %s", data)
         return True
@@ -393,85 +811,105 @@ class Board(LoggableClass):
         """
         Interrupt-Methode für den Taster am Pin :data:`config.SHUTDOWN_BUTTON`.
 
-        Wird mit einer Bouncetime von 200ms an beiden Flanken gerufen, also sowohl
-        wenn der Taster gedrückt also auch losgelassen wurde.
+        Wird mit einer Bouncetime von 200ms an der fallenden Flanke gerufen, also
+        wenn der Taster gedrückt wurde.
 
         Da der Taster über einen 10K - Pullup den Pin auf LOW zieht, wird
         bei einem LOW Signal davon ausgegangen, dass der Taster gedrückt und
         bei einem HIGH Signal losgelassen wurde.
 
-        Zur Vermeidung der Interpretation von Fehlsignalen, wird auch genau diese
-        Reihenfolge (erst drücken, dann loslassen) erwartet und in allen andere
-        Fällen keine Verarbeitung durchgeführt.
-        Hierzu wird der Zeitpunkt des Drückens in :attr:`shutdown_btn_time`
-        verwendet. Bei einem LOW-Signal (gedrückt) muss dieser 0 sein und wird
-        dann auf die aktuelle Zeit gesetzt, bei HIGH (losgelassen) darf er
-        nicht 0 sein und wird nach Auswertung wieder auf 0 gesetzt.
+        Ist der Pin beim Aufruf nicht (mehr) LOW, wird von einem Fehlsignal ausgegangen
+        und keine Verarbeitung durchgeführt. Ansonsten wird der Zeitpunkt des Drückens
+        an :meth:`_WatchShutdownButton` in einem eigenen, kurzlebigen Thread übergeben und
+        sofort zurückgekehrt, da ``RPi.GPIO`` alle Interrupt-Methoden in einem einzigen
+        Thread ruft und dieser sonst für die gesamte Dauer des Drückens blockiert wäre.
+        Läuft noch eine Überwachung, wird die Flanke ignoriert.
+        """
+        # der Button zieht das permanente HIGH-Signal auf LOW, wenn
+        # er gedrückt wird (PULL_UP)
+        if GPIO.input(SHUTDOWN_BUTTON) != GPIO.LOW:
+            # da stimmt was nicht, also ignorieren
+            return
+        pressed_at = time.monotonic()
+        button_thread = self._button_thread
+        if button_thread is not None and button_thread.is_alive():
+            return
+        self._button_thread = threading.Thread(
+            target = self._WatchShutdownButton, args = (pressed_at,),
+            name = "ShutdownButton", daemon = True)
+        self._button_thread.start()
+
+    def _WatchShutdownButton(self, pressed_at:float):
+        """
+        Thread-Funktion für :meth:`OnShutdownButtonPressed`.
+
+        Prüft im Abstand von :data:`config.BTN_POLL_INTERVAL` Sekunden, ob der Taster wieder
+        losgelassen wurde, höchstens aber bis :data:`config.BTN_DURATION_SHUTDOWN`
+        überschritten ist. Eine Flankenerkennung mit ``GPIO.wait_for_edge`` ist hier nicht
+        möglich, da für den Pin bereits die Interrupt-Erkennung aktiv ist.
 
         Die so ermittelt Zeit führt dann zu jeweiligen Aktion:
          - länger als :data:`config.BTN_DURATION_SHUTDOWN` Sekunden: Shutdown
          - länger als :data:`config.BTN_DURATION_REBOOT` Sekunden: Reboot
          - weniger als :data:`config.BTN_DURATION_REBOOT` Sekunden: keine Aktion
 
-        Die Aktionen werden über ``os.system`` ausgeführt, der Prozess muss also
-        entsprechende Rechte verfügen.
+        Die Aktionen werden über ``subprocess.Popen`` in einer eigenen Session gestartet,
+        ohne auf deren Ende zu warten, der Prozess muss also über entsprechende Rechte verfügen.
+
+        :param float pressed_at: Zeitpunkt des Drückens (``time.monotonic()``).
         """
-        # der Button zieht das permanente HIGH-Signal auf LOW, wenn
-        # er gedrückt wird (PULL_UP)
-        if GPIO.input(SHUTDOWN_BUTTON) == GPIO.LOW:
-            # der Knopf ist gedrückt.
-            if self.shutdown_btn_time != 0:
-                # da stimmt was nicht, wir ignorieren lieber alles,
-                # setzen den Wert aber zurück
-                self.shutdown_btn_time = 0
-                return
-            self.shutdown_btn_time = time.time()
-        else:
-            # der Knopf wurde losgelassen
-            if self.shutdown_btn_time == 0:
-                # auch hier wäre jetzt was verkehrt, also
-                # ignorieren
-                return
-            # jetzt prüfen, wie lange er gedrückt war.
-            pressed_duration = time.time() - self.shutdown_btn_time
-            # und setzen den Wert wieder zurück
-            self.shutdown_btn_time = 0
-            self.info("Shutdown button has been pressed for %.2f seconds.", pressed_duration)
-            if pressed_duration > BTN_DURATION_SHUTDOWN:
-                # shutdown
-                self.info("Shutting system down.")
-                os.system("sudo shutdown -h now")
-            elif pressed_duration > BTN_DURATION_REBOOT:
-                # reboot
-                self.info("Rebooting system.")
-                os.system("sudo reboot -h now")
+        # etwas länger als die Shutdown-Dauer warten, damit diese sicher überschritten wird
+        deadline = pressed_at + BTN_DURATION_SHUTDOWN + BTN_POLL_INTERVAL
+        while GPIO.input(SHUTDOWN_BUTTON) == GPIO.LOW and time.monotonic() < deadline:
+            time.sleep(BTN_POLL_INTERVAL)
+        # jetzt prüfen, wie lange er gedrückt war.
+        pressed_duration = time.monotonic() - pressed_at
+        self.info("Shutdown button has been pressed for %.2f seconds.", pressed_duration)
+        if pressed_duration > BTN_DURATION_SHUTDOWN:
+            # shutdown
+            self.info("Shutting system down.")
+            subprocess.Popen(_SHUTDOWN_CMD, start_new_session = True)
+        elif pressed_duration > BTN_DURATION_REBOOT:
+            # reboot
+            self.info("Rebooting system.")
+            subprocess.Popen(_REBOOT_CMD, start_new_session = True)
     # -----------------------------------------------------------------------------------
     # --- LICHT -------------------------------------------------------------------------
     # -----------------------------------------------------------------------------------
     def SwitchOutdoorLight(self, swon:bool):
         """
         Schaltet das Aussenlicht ein, wenn ``swon`` True ist. (sonst aus)
+        Ist das Licht bereits im gewünschten Zustand, erfolgt keine Aktion.
 
         .. seealso::
             :meth:`SwitchIndoorLight`
             :meth:`IsOutdoorLightOn`
         """
+        swon = bool(swon)
+        if swon == self.light_state_outdoor:
+            # Relais ist bereits im gewünschten Zustand, also keine Änderung
+            return
         self.light_state_outdoor = swon
-        GPIO.output(LIGHT_OUTDOOR, RELAIS_ON if swon else RELAIS_OFF)
-        self.info("Switched outdoor light %s", "on" if swon else "off")
+        GPIO.output(LIGHT_OUTDOOR, _RELAIS[swon])
+        self.info("Switched outdoor light %s", _ONOFF[swon])
         self._CallStateChangeHandler()
 
     def SwitchIndoorLight(self, swon:bool):
         """
         Schaltet die Innenbeleuchtung ein, wenn ``swon`` True ist. (sonst aus).
+        Ist das Licht bereits im gewünschten Zustand, erfolgt keine Aktion.
 
         .. seealso::
             :meth:`SwitchOutdoorLight`
             :meth:`IsIndoorLightOn`
         """
+        swon = bool(swon)
+        if swon == self.light_state_indoor:
+            # Relais ist bereits im gewünschten Zustand, also keine Änderung
+            return
         self.light_state_indoor = swon
-        GPIO.output(LIGHT_INDOOR, RELAIS_ON if swon else RELAIS_OFF)
-        self.info("Switched indoor light %s", "on" if swon else "off")
+        GPIO.output(LIGHT_INDOOR, _RELAIS[swon])
+        self.info("Switched indoor light %s", _ONOFF[swon])
         self._CallStateChangeHandler()
 
     def IsIndoorLightOn(self)->bool:
@@ -521,10 +959,13 @@ class Board(LoggableClass):
             :meth:`StopMotor`
             :meth:`_SetDoorState`
         """
-        self.info("Starting motor (%s).", "up" if direction == MOVE_UP else "down")
-        GPIO.output(MOVE_DIR, direction)
-        GPIO.output(MOTOR_ON, RELAIS_ON)
-        self._SetDoorState(DOOR_MOVING_UP if direction == MOVE_UP else DOOR_MOVING_DOWN)
+        str_dir, _, moving_state, _, _, _ = self._MOVE_PARAMS[direction == MOVE_UP]
+        self.info("Starting motor (%s).", str_dir)
+        self._reed_cache.clear()
+        self._state_cache = None
+        # Reihenfolge beachten: erst die Richtung, dann den Motor schalten
+        GPIO.output([MOVE_DIR, MOTOR_ON], [direction, RELAIS_ON])
+        self._SetDoorState(moving_state)
 
     def StopMotor(self, end_state:int = DOOR_NOT_MOVING):
         """
@@ -535,9 +976,13 @@ class Board(LoggableClass):
             :data:`config.DOOR_OPEN` oder :data:`config.DOOR_CLOSED`.
         """
         self.info("Stopping motor.")
-        GPIO.output(MOTOR_ON, RELAIS_OFF)
-        GPIO.output(MOVE_DIR, MOVE_UP)
-        self._SetDoorState(end_state)
+        with self._motor_lock:
+            self._reed_cache.clear()
+            self._state_cache = None
+            # erst den Motor aus, dann die Richtung zurücksetzen; mehrere Pins werden
+            # grundsätzlich mit einem einzigen GPIO.output geschrieben
+            GPIO.output([MOTOR_ON, MOVE_DIR], [RELAIS_OFF, MOVE_UP])
+            self._SetDoorState(end_state)
 
     def SyncMoveDoor(self, direction:int)->bool:
         """
@@ -562,13 +1007,28 @@ class Board(LoggableClass):
         Sollte der jeweilige Magnetkontakt nicht auslösen, wird die oben genannte Bewegungszeit
         als Maximum verwendet und bei Erreichen der Motor angehalten.
 
+        Während der Bewegung wird auf eine fallende Flanke am Magnetkontakt gewartet
+        (:meth:`_WaitForReedEdge`), spätestens aber nach :data:`config.REED_POLL_INTERVAL`
+        Sekunden mit einer einzelnen Messung (:meth:`_ReedSampleOnce`) geprüft.
+        Nach Ablauf des Anteils :data:`config.REED_POLL_FINE_RATIO` der maximalen
+        Bewegungszeit wird stattdessen im Abstand von :data:`config.REED_POLL_INTERVAL_FINE`
+        Sekunden gemessen.
+        Erst wenn diese einen geschlossenen Kontakt liefert, wird das Schließen über die
+        Messreihe in :meth:`_DebounceReed` bestätigt.
+
         In beiden Fällen wird dann der Zustand der Tür entsprechend der Bewegungsrichtung
         gesetzt.
 
+        Wird die Bewegung über :meth:`StopDoor` abgebrochen, wird die Schleife verlassen,
+        ohne den Endzustand zu setzen (die Tür bleibt dann :data:`config.DOOR_NOT_MOVING`).
+        Ein Abbruch zählt ab dem Aufruf, also auch während der Messung vor dem Start des
+        Motors; der Motor wird dann gar nicht erst gestartet.
+
         :param int direction: Bewegungsrichtung der Tür.
             Kann entweder :data:`config.MOVE_UP` oder :data:`config.MOVE_DOWN` sein.
 
-        :returns: Ob die Tür bewegt wurde.
+        :returns: Ob die Tür bis in die Endposition bewegt wurde, ``False`` auch bei einem
+            Abbruch über :meth:`StopDoor`.
 
         .. seealso::
             :meth:`StartMotor`
@@ -576,20 +1036,20 @@ class Board(LoggableClass):
             :meth:`IsReedClosed`
             :meth:`IsDoorMoving`
         """
-        if direction == MOVE_UP:
-            str_dir = "up"
-            reed_pin = REED_UPPER
-            end_state = DOOR_OPEN
-            max_duration = DOOR_MOVE_UP_TIME
-            reed_offset = UPPER_REED_OFFSET
-        else:
-            str_dir = "down"
-            reed_pin = REED_LOWER
-            end_state = DOOR_CLOSED
-            max_duration = DOOR_MOVE_DOWN_TIME
-            reed_offset = LOWER_REED_OFFSET
-
-        can_move = not self.IsReedClosed(reed_pin)
+        str_dir, reed_pin, _, end_state, max_duration, reed_offset = \
+            self._MOVE_PARAMS[direction == MOVE_UP]
+
+        stop_event = self._stop_event
+        with self._motor_lock:
+            if self.IsDoorMoving():
+                # die laufende Bewegung muss per StopDoor abbrechbar bleiben
+                self.error("Cannot move door, already moving!")
+                return False
+            stop_event.clear()
+
+        # hier keinen zwischengespeicherten Wert verwenden, die Tür
+        # könnte sich zwischenzeitlich bewegt haben
+        can_move = not self._MeasureReed(reed_pin)
         if can_move:
             # wenn der Magnetkontakt HIGH liefert, kann es sich um
             # eine Störung halten, deshalb prüfen wir
@@ -605,32 +1065,146 @@ class Board(LoggableClass):
 
         self.debug("Moving door %s synchronized (max. %.2f seconds).", str_dir, max_duration)
 
-        self.StartMotor(direction)
+        with self._motor_lock:
+            if stop_event.is_set():
+                self.info("Moving %s has been stopped before start.", str_dir)
+                return False
+            if self.IsDoorMoving():
+                self.error("Cannot move door, already moving!")
+                return False
+            self.StartMotor(direction)
 
         # maximale Dauer der Anschaltzeit des Motor
-        move_end_time = time.time() + max_duration
+        move_start_time = time.monotonic()
+        move_end_time = move_start_time + max_duration
+        # ab diesem Zeitpunkt wird die Tür bald erwartet, also feiner gemessen
+        fine_poll_time = move_start_time + max_duration * REED_POLL_FINE_RATIO
 
+        monotonic = time.monotonic
         reed_signaled = False
-        while not reed_signaled and (move_end_time > time.time()):
-            reed_signaled = self.IsReedClosed(reed_pin)
+        while True:
+            # zuerst nur eine einzelne Messung, erst wenn diese einen geschlossenen
+            # Kontakt liefert, folgt die vollständige Messreihe
+            if self._ReedSampleOnce(reed_pin) and self._DebounceReed(reed_pin):
+                reed_signaled = True
+                break
+            now = monotonic()
+            time_left = move_end_time - now
+            if time_left <= 0.0:
+                break
+            # bis zur nächsten Flanke schlafen, spätestens aber nach dem Pollintervall
+            # erneut messen, falls die Flanke durch Interferenzen verloren gegangen ist
+            poll_interval = REED_POLL_INTERVAL if now < fine_poll_time else REED_POLL_INTERVAL_FINE
+            self._WaitForReedEdge(reed_pin, min(time_left, poll_interval))
+            if stop_event.is_set():
+                break
+
+        if stop_event.is_set():
+            self.info("Moving %s has been stopped.", str_dir)
+            return False
 
         if reed_signaled:
             self.info("Reed %s has been closed.", str_dir)
-            time.sleep(reed_offset)
+            if stop_event.wait(reed_offset):
+                self.info("Moving %s has been stopped.", str_dir)
+                return False
         else:
             self.warning("Reed %s not closed, reached timeout.", str_dir)
 
-        self.StopMotor(end_state)
+        # unter demselben Lock wie StopDoor prüfen, damit ein Abbruch Vorrang hat
+        with self._motor_lock:
+            if stop_event.is_set():
+                self.info("Moving %s has been stopped.", str_dir)
+                return False
+            self.StopMotor(end_state)
         return True
 
-    def IsReedClosed(self, reed_pin:int)->bool:
+    def _ReedSampleOnce(self, reed_pin:int)->bool:
         """
-        Gibt an, ob der Magnetkontakt am entsprechenden Pin geschlossen ist.
+        Liefert das Ergebnis einer einzelnen, nicht entprellten Messung am Magnetkontakt
+        ``reed_pin`` (``True`` = geschlossen).
+
+        .. seealso::
+            :meth:`IsReedClosed`
+            :meth:`SyncMoveDoor`
+        """
+        return GPIO.input(reed_pin) == REED_CLOSED
+
+    def _WaitForReedEdge(self, reed_pin:int, timeout:float)->bool:
+        """
+        Wartet maximal ``timeout`` Sekunden auf eine fallende Flanke am Magnetkontakt
+        ``reed_pin``, ohne dabei die CPU zu belasten (``GPIO.wait_for_edge``).
+
+        Die Flanke dient nur zum vorzeitigen Aufwecken, ob der Kontakt wirklich geschlossen
+        ist, muss der Aufrufer anschließend selbst prüfen. Wartet bereits ein anderer Thread
+        an diesem Pin, wird stattdessen einfach ``timeout`` Sekunden geschlafen.
+
+        :returns: ``True`` wenn eine Flanke erkannt wurde, ``False`` bei Timeout.
+        """
+        if timeout <= 0.0:
+            return False
+        try:
+            channel = GPIO.wait_for_edge(
+                reed_pin, GPIO.FALLING, timeout = max(1, int(timeout * 1000)))
+        except RuntimeError:
+            # Flankenerkennung ist an diesem Pin bereits aktiv
+            time.sleep(timeout)
+            return False
+        return channel is not None
+
+    def _DebounceReed(self, reed_pin:int)->bool:
+        """
+        Entprellt den Magnetkontakt am Pin ``reed_pin``.
         Da es immer wieder Probleme durch Interferenzen mit dem Weidezaun gab, werden
         hier 15 Messungen in 0,7 Sekunden durchgeführt.
-        Wenn mindestens 5x der Kontakt als geschlossen ermittelt wurde, wird der
+        Wenn mindestens 5x der Kontakt als geschlossen ermittelt wurde,
         gehen wir hier von einem echten Schließen aus.
 
+        Die Messungen werden als Bitmaske gesammelt, die Treffer ergeben sich aus
+        der Anzahl der gesetzten Bits. Sobald mit den verbleibenden Messungen keine
+        5 Treffer mehr erreichbar sind, wird die Messreihe vorzeitig beendet.
+
+        :returns: Ob der angegebene Magentkontakt geschlossen ist.
+
+        .. seealso::
+            :meth:`IsReedClosed`
+        """
+        # in der Schleife nur lokale Namen verwenden
+        gpio_input = GPIO.input
+        reed_closed = REED_CLOSED
+        sleep = time.sleep
+        # jede Messung wird als Bit in mask geschoben (1 = geschlossen),
+        # die Anzahl gesetzter Bits ist dann die Anzahl der Treffer
+        mask = triggered = i = 0
+        for i in range(15):
+            mask = (mask << 1) | (gpio_input(reed_pin) == reed_closed)
+            triggered = bin(mask).count('1')
+            if triggered >= 5:
+                # der Magnetkontakt war jetzt 5x
+                # geschlossen, damit ist die Bedingung erfüllt
+                self.info("Reed trigger: %d of %d", triggered, i + 1)
+                return True
+            if triggered + 14 - i < 5:
+                # selbst wenn alle restlichen Messungen treffen,
+                # reicht es nicht mehr (deckt auch die letzte Messung ab)
+                break
+            sleep(0.05)
+        self.info("Reed trigger: %d of %d", triggered, i + 1)
+        return False
+
+    def IsReedClosed(self, reed_pin:int)->bool:
+        """
+        Gibt an, ob der Magnetkontakt am entsprechenden Pin geschlossen ist.
+
+        Ist der Kontakt bei der ersten Messung offen, wird bis zu
+        :data:`config.REED_EDGE_TIMEOUT` Sekunden auf eine fallende Flanke gewartet
+        (:meth:`_WaitForReedEdge`). Bleibt diese aus, gilt der Kontakt als offen.
+        Ansonsten wird der Kontakt über die Messreihe in :meth:`_DebounceReed` geprüft.
+
+        Das Ergebnis wird für :data:`config.REED_CACHE_TTL` Sekunden in :attr:`_reed_cache`
+        zwischengespeichert, so dass kurz aufeinanderfolgende Abfragen (z.Bsp. über
+        :meth:`GetState`) nicht jedes Mal eine neue Messreihe auslösen.
+
         :param int reed_pin: Pin des Magnetkontakts, also entweder :data:`config.REED_UPPER`
             oder :data:`config.REED_LOWER`
 
@@ -641,19 +1215,37 @@ class Board(LoggableClass):
             :meth:`IsDoorClosed`
             :meth:`SyncMoveDoor`
         """
-        triggered = i = 0
-        for i in range(15):
-            if GPIO.input(reed_pin) == REED_CLOSED:
-                if triggered > 4:
-                    # der Magnetkontakt war jetzt 4x
-                    # geschlossen, damit ist die Bedingung erfüllt
-                    self.info("Reed trigger: %d of %d", triggered, i)
-                    return True
-                triggered += 1
-            if i < 14: # nach dem letzten Messen warten wir nicht
-                time.sleep(0.05)
-        self.info("Reed trigger: %d of %d", triggered, i)
-        return False
+        cached = self._reed_cache.get(reed_pin)
+        if cached and (time.monotonic() - cached[0]) < REED_CACHE_TTL:
+            return cached[1]
+        result = self._MeasureReed(reed_pin)
+        self._reed_cache[reed_pin] = (time.monotonic(), result)
+        return result
+
+    def _MeasureReed(self, reed_pin:int)->bool:
+        """
+        Misst den Zustand des Magnetkontakts am Pin ``reed_pin`` wie in :meth:`IsReedClosed`
+        beschrieben, allerdings immer neu (also ohne Zwischenspeicher).
+
+        :returns: Ob der angegebene Magentkontakt geschlossen ist.
+        """
+        if not self._ReedSampleOnce(reed_pin):
+            if not self._WaitForReedEdge(reed_pin, REED_EDGE_TIMEOUT):
+                return False
+        return self._DebounceReed(reed_pin)
+
+    def _ReadReeds(self, known_open:int = None)->tuple:
+        """
+        Misst beide Magnetkontakte über :meth:`IsReedClosed`, jeden höchstens einmal.
+        Der Kontakt ``known_open`` wurde vom Aufrufer bereits als offen gemessen und wird
+        nicht erneut gemessen, auch wenn sein Eintrag in :attr:`_reed_cache` während der
+        Messung des anderen Kontakts abgelaufen ist.
+
+        :returns: Tuple aus (unten geschlossen, oben geschlossen).
+        """
+        lower = known_open != REED_LOWER and self.IsReedClosed(REED_LOWER)
+        upper = known_open != REED_UPPER and self.IsReedClosed(REED_UPPER)
+        return lower, upper
 
     def IsDoorOpen(self)->bool:
         """
@@ -664,6 +1256,10 @@ class Board(LoggableClass):
         zu Messfehlern am Magnetkontakt kommt, wird - falls :meth:`IsReedClosed` ``False``
         liefert - der gespeicherte Zustand der Tür aus :attr:`door_state` geprüft.
 
+        Da beides mit ODER verknüpft ist, wird der gespeicherte Zustand zuerst
+        geprüft: steht dieser bereits auf :data:`config.DOOR_OPEN`, entfällt die
+        Messung am Magnetkontakt.
+
         :returns: Ob die Tür offen ist.
 
         .. seealso::
@@ -671,21 +1267,21 @@ class Board(LoggableClass):
             :meth:`IsReedClosed`
             :meth:`SyncMoveDoor`
         """
-        if not self.IsReedClosed(REED_UPPER):
-            # wenn der Magnetschalter behauptet, dass er
-            # nicht geschlossen ist, nehmen wir sicher-
-            # heitshalber den gespeicherten Zustand
-            return bool(self.door_state & DOOR_OPEN)
-        return True
+        if self.door_state & DOOR_OPEN:
+            # der gespeicherte Zustand ist eindeutig,
+            # da muss der Kontakt nicht gemessen werden
+            return True
+        # ansonsten entscheidet der Magnetschalter
+        return self.IsReedClosed(REED_UPPER)
 
     def IsDoorClosed(self)->bool:
         """
         Gibt zurück, ob die Tür geschlossen ist.
         Siehe :meth:`IsDoorOpen` für weitere Details.
         """
-        if not self.IsReedClosed(REED_LOWER):
-            return bool(self.door_state & DOOR_CLOSED)
-        return True
+        if self.door_state & DOOR_CLOSED:
+            return True
+        return self.IsReedClosed(REED_LOWER)
 
     def IsDoorMoving(self)->bool:
         """
@@ -715,14 +1311,16 @@ class Board(LoggableClass):
     def StopDoor(self):
         """
         Hält die Tür an (insofern sie sich gerade bewegt).
-        Ruft lediglich :meth:`StopMotor`.
+        Bricht eine laufende Bewegung in :meth:`SyncMoveDoor` ab und ruft :meth:`StopMotor`.
 
         .. seealso::
             :meth:`OpenDoor`
             :meth:`CloseDoor`
         """
         self.info("Executing StopDoor command.")
-        self.StopMotor()
+        with self._motor_lock:
+            self._stop_event.set()
+            self.StopMotor()
     # -----------------------------------------------------------------------------------
     # --- Sensoren ----------------------------------------------------------------------
     # -----------------------------------------------------------------------------------
@@ -740,6 +1338,13 @@ class Board(LoggableClass):
         """
         return self.sensor.ReadLight()
 
+    def GetSensorValues(self)->dict:
+        """
+        Liefert Temperatur und Helligkeit mit einem Aufruf.
+        Siehe dazu :meth:`Sensors.ReadAll`.
+        """
+        return self.sensor.ReadAll()
+
     def GetState(self):
         """
         Gibt den aktuellen Status des Board als Dictionary zurück.
@@ -753,23 +1358,55 @@ class Board(LoggableClass):
             - :data:`config.DOOR_MOVING`: Tür bewegt sich gerade
             - :data:`config.DOOR_CLOSED`: Tür ist geschlossen
             - :data:`config.DOOR_OPEN`: Tür ist offen
-            - :data:`config.DOOR_NOT_MOVING`: Fehler
+            - :data:`config.DOOR_NOT_MOVING`: Fehler bzw. unbekannt
+
+        Der Türzustand wird über :attr:`_DOOR_BY_STATE` aus dem gespeicherten Zustand
+        ermittelt. Eine gespeicherte Endposition wird über den zugehörigen Magnetkontakt
+        (:attr:`_END_REED`) bestätigt, damit eine von Hand bewegte Tür erkannt wird.
+        Ist sie nicht bestätigt oder der gespeicherte Zustand nicht eindeutig, werden beide
+        Magnetkontakte über :meth:`_ReadReeds` gemessen (jeder höchstens einmal) und über
+        :attr:`_DOOR_BY_REEDS` ausgewertet, melden beide geschlossen, ist das ein Fehler.
+        Melden beide offen, bleibt eine gespeicherte Endposition bestehen (wie in
+        :meth:`IsDoorOpen` gilt dies als Messfehler). Melden die Magnetkontakte dagegen die
+        andere Endposition, wurde die Tür von Hand bewegt: diese wird über
+        :meth:`_SetDoorState` nach :attr:`door_state` übernommen (und gespeichert), damit
+        :meth:`IsDoorOpen`, :meth:`IsDoorClosed` und :meth:`SyncMoveDoor` dazu passen.
+
+        Das Ergebnis wird für :data:`config.STATE_CACHE_TTL` Sekunden in
+        :attr:`_state_cache` vorgehalten, solange sich Tür- und Lichtzustände nicht ändern.
         """
-        result = {
+        now = time.monotonic()
+        door_state = self.door_state
+        key = (door_state, self.light_state_indoor, self.light_state_outdoor)
+        cached = self._state_cache
+        if cached is not None and cached[1] == key and now - cached[0] < STATE_CACHE_TTL:
+            # Da der Aufrufer das Ergebnis verändern darf (siehe z.Bsp.
+            # Controller._AddStateInfo), wird immer eine Kopie geliefert.
+            return cached[2].copy()
+
+        door = self._DOOR_BY_STATE[door_state & 0x0F]
+        end_reed = self._END_REED.get(door)
+        if door is None or (end_reed is not None and not self.IsReedClosed(end_reed)):
+            lower, upper = self._ReadReeds(end_reed)
+            reeds = (lower << 1) | upper
+            if door is None or reeds:
+                # sind beide offen, bleibt die gespeicherte Endposition (Messfehler)
+                door = self._DOOR_BY_REEDS[reeds]
+            if end_reed is not None and door in self._END_REED and door != door_state:
+                # von Hand bewegt: neue Endposition übernehmen, außer es hat
+                # inzwischen eine Bewegung begonnen
+                with self._motor_lock:
+                    if self.door_state == door_state:
+                        self._SetDoorState(door)
+                key = (self.door_state, self.light_state_indoor, self.light_state_outdoor)
+
+        state = {
             "indoor_light": self.light_state_indoor,
             "outdoor_light": self.light_state_outdoor,
+            "door": door,
         }
-
-        if self.IsDoorMoving():
-            result["door"] = DOOR_MOVING
-        elif self.IsDoorClosed():
-            result["door"] = DOOR_CLOSED
-        elif self.IsDoorOpen():
-            result["door"] = DOOR_OPEN
-        else:
-            result["door"] = DOOR_NOT_MOVING
-
-        return result
+        self._state_cache = (now, key, state)
+        return state.copy()
 
     def SetStateChangeHandler(self, handler:callable):
         """
@@ -790,17 +1427,72 @@ class Board(LoggableClass):
     def _CallStateChangeHandler(self):
         """
         Wird intern bei jeder Änderung des aktuellen Status gerufen.
-        Speichert den Status mittels :meth:`Save` und ruft dann den
+        Speichert den Status mittels :meth:`Save` und benachrichtigt dann den
         Change-Handler, insofern gesetzt.
 
+        Der Change-Handler wird nicht direkt gerufen, sondern über einen ``threading.Timer``
+        nach :data:`config.STATE_COALESCE_TIME` Sekunden (siehe :meth:`_NotifyStateChange`).
+        Alle bis dahin eingehenden Änderungen werden so zu einem einzigen Aufruf mit dem
+        aktuellen Status zusammengefasst, und z.Bsp. das Stoppen des Motors muss nicht
+        auf den Handler warten.
+
         .. seealso::
             :meth:`SetStateChangeHandler`
             :meth:`GetState`
         """
         self.Save()
-        if self.state_change_handler:
-            self.debug("Calling state change handler")
+        if not self.state_change_handler:
+            return
+        with self._timer_lock:
+            if self._pending_timer is not None:
+                # jede weitere Änderung verschiebt den Aufruf, bis es ruhig ist
+                self._pending_timer.cancel()
+            self._pending_timer = threading.Timer(STATE_COALESCE_TIME, self._NotifyStateChange)
+            self._pending_timer.daemon = True
+            self._pending_timer.start()
+
+    def FlushStateChanges(self):
+        """
+        Führt alle noch ausstehenden Aktionen nach Statusänderungen sofort und synchron
+        aus: ein geplanter Aufruf des Change-Handlers (siehe :meth:`_CallStateChangeHandler`)
+        wird direkt erledigt und ein noch nicht geschriebener Zustand aus :meth:`Save` in
+        die Datei geschrieben. Schreibt der Thread aus :meth:`_WriteStates` gerade, wird
+        gewartet, bis er damit fertig ist. Wird von :meth:`close` gerufen.
+        """
+        with self._timer_lock:
+            timer = self._pending_timer
+            self._pending_timer = None
+        if timer is not None:
+            timer.cancel()
+            self._NotifyStateChange()
+        try:
+            data = self._save_queue.get_nowait()
+        except queue.Empty:
+            pass
+        else:
             try:
-                self.state_change_handler(self.GetState())
-            except Exception:
-                self.exception("Error while calling state change handler.")
\ No newline at end of file
+                if not self._WriteState(data):
+                    self._saved_door_state = None
+            finally:
+                self._save_queue.task_done()
+        # auf einen gerade im Writer-Thread laufenden Schreibvorgang warten, sonst
+        # würde dieser beim Beenden des Prozesses abgebrochen
+        self._save_queue.join()
+
+    def _NotifyStateChange(self):
+        """
+        Wird vom Timer aus :meth:`_CallStateChangeHandler` gerufen und übergibt den
+        aktuellen Status an den Change-Handler.
+        """
+        with self._timer_lock:
+            # Timer ist ein Thread, nur den eigenen Eintrag entfernen
+            if self._pending_timer is threading.current_thread():
+                self._pending_timer = None
+        handler = self.state_change_handler
+        if not handler:
+            return
+        self.debug("Calling state change handler")
+        try:
+            handler(self.GetState())
+        except Exception:
+            self.exception("Error while calling state change handler.")
@@ -20,13 +20,17 @@ auf :data:`config.MAX_STREAM_TIME` Sekunden beschränkt, ausserdem sind nicht me
 :data:`config.MAX_STREAM_COUNT` parallele Zugriffe erlaubt.
 Falls diese Restriktionen greifen, wird ein 503-Response ausgeliefert (mit entsprechender Meldung)
 
+Requests werden von höchstens :data:`MAX_WORKERS` Threads bearbeitet, sind alle belegt, wird
+die Verbindung sofort mit einem 503-Response beendet.
+
 Achtung!
 --------
 
 Falls ``PiCamera`` aus dem ``picamera``-Modul nicht importiert werden kann, wird eine
 Mockup-Klasse erzeugt, die nacheinander die Bilder im Ordner */pics* unterhalb des
 :data:`resource_path` mit dem Pattern ``<nr>.jpg``  (also *0.jpg*, *1.jpg* u.s.w) statt des
-Kamerabildes ausliefert. Nur zum Testen!
+Kamerabildes ausliefert. Fehlen diese Bilder, wird stattdessen ein graues Ersatzbild
+geliefert. Nur zum Testen!
 
 Klassen und Funktionen
 ----------------------
@@ -34,10 +38,11 @@ Klassen und Funktionen
 # --------------------------------------------------------------------------------------------------
 # pylint: disable=C0103,R0903
 # --------------------------------------------------------------------------------------------------
-import io
-import socketserver
+import json
+import queue
+import socket
 import time
-from threading import Condition, RLock
+from threading import Condition, Event, Lock, RLock, Thread
 from http import server
 # --------------------------------------------------------------------------------------------------
 from config import * # pylint: disable=W0614
@@ -49,11 +54,26 @@ RESOLUTION = (CAM_WIDTH, CAM_HEIGHT)
 #: Nummer des Frames, welcher bei Steady verschickt werden soll, wenn die Kamera nicht
 #: bereits aktiv war. Damit werden etwaige Bilder in der Ausbalancierungsphase übersprungen.
 SKIP_STEADY_FRAMES = 5
+
+#: Maximale Anzahl von Threads, die im :class:`StreamingServer` Requests bearbeiten.
+MAX_WORKERS = MAX_STREAM_COUNT + 2
 # --------------------------------------------------------------------------------------------------
 try:
     from picamera import PiCamera
 except ImportError:
-    from threading import Thread
+    #: Ersatzbild für das Mockup, falls die Testbilder fehlen: ein graues JPEG mit 8x8
+    #: Bildpunkten (ein einziger Block, dessen DC- und AC-Anteile alle 0 sind).
+    _PLACEHOLDER_JPEG = (
+        b'\xff\xd8'                                                 # SOI
+        b'\xff\xdb\x00\x43\x00' + b'\x01' * 64 +                    # Quantisierung
+        b'\xff\xc0\x00\x0b\x08\x00\x08\x00\x08\x01\x01\x11\x00'     # 8x8, Graustufen
+        b'\xff\xc4\x00\x14\x00\x01' + b'\x00' * 16 +                # DC: nur Kategorie 0
+        b'\xff\xc4\x00\x14\x10\x01' + b'\x00' * 16 +                # AC: nur EOB
+        b'\xff\xda\x00\x08\x01\x01\x00\x00\x3f\x00'                 # SOS
+        b'\x3f'                                                     # DC 0, EOB, Füllbits
+        b'\xff\xd9'                                                 # EOI
+    )
+
     class PiCamera(LoggableClass):
         """
         Test-Mockup für PiCamera.
@@ -67,10 +87,26 @@ except ImportError:
             self._terminate = False
             self._recording = False
             self._img_path = resource_path / 'pics'
+            # die Bilder nur einmal lesen, statt für jeden Frame die Datei zu öffnen
+            self._frames = self._LoadFrames()
             self._waiter = Condition()
             self._thread = Thread(target = self._ThreadLoop, name = "camera")
             self._thread.start()
 
+        def _LoadFrames(self):
+            """
+            Liest die Bilder ``0.jpg`` bis ``9.jpg`` aus dem Ordner *pics*. Fehlen diese, wird
+            stattdessen nur :data:`_PLACEHOLDER_JPEG` ausgeliefert.
+            """
+            try:
+                return [
+                    (self._img_path / (str(img_num) + '.jpg')).read_bytes()
+                    for img_num in range(10)
+                ]
+            except OSError:
+                self.warning("Missing test images in %s, using a placeholder.", self._img_path)
+                return [_PLACEHOLDER_JPEG]
+
         def start_recording(
                 self, output,
                 format = None, resize = None, splitter_port = 1, **options):
@@ -98,20 +134,24 @@ except ImportError:
 
             img_num = 0
             frame_time = 1.0 / float(self.framerate)
+            # feste Zeitpunkte pro Frame, damit sich Verzögerungen nicht aufsummieren
+            next_frame_time = time.monotonic()
             while not self._terminate:
-                loop_t = time.time()
                 if self._recording:
-                    p = self._img_path / (str(img_num) + '.jpg')
+                    self.output.write(self._frames[img_num])
                     img_num += 1
-                    if img_num == 10:
+                    if img_num == len(self._frames):
                         img_num = 0
-                    with p.open('rb') as f:
-                        self.output.write(f.read())
                 if self._terminate:
                     break
-                sleep_time = frame_time - (time.time() - loop_t)
+                now = time.monotonic()
+                next_frame_time += frame_time
+                if next_frame_time <= now:
+                    # zu spät dran, nicht mit mehreren Frames am Stück aufholen,
+                    # sondern ab jetzt wieder einen vollen Frame warten
+                    next_frame_time = now + frame_time
                 with self._waiter:
-                    self._waiter.wait(sleep_time)
+                    self._waiter.wait(next_frame_time - now)
 
             self.info("Camera thread stopped.")
 # --------------------------------------------------------------------------------------------------
@@ -130,45 +170,126 @@ PAGE = """\
   </body>
 </html>
 """.format(**globals())
+
+#: :data:`PAGE` als UTF-8 kodierte Bytes für die Auslieferung.
+PAGE_BYTES = PAGE.encode('utf-8')
+
+#: Länge von :data:`PAGE_BYTES` für den ``Content-Length``-Header.
+PAGE_LEN = len(PAGE_BYTES)
+
+#: Vollständiger Antwortkopf für ``/stream.mjpg``. Der Server antwortet mit HTTP/1.0, "chunked"
+#: ist also nicht möglich: das Ende des Streams ist das Schließen der Verbindung, Proxies (nginx)
+#: sollen nicht puffern.
+STREAM_PREAMBLE = (
+    b'HTTP/1.0 200 OK\r\n'
+    b'Age: 0\r\n'
+    b'Cache-Control: no-cache, private\r\n'
+    b'Pragma: no-cache\r\n'
+    b'Content-Type: multipart/x-mixed-replace; boundary=FRAME\r\n'
+    b'Connection: close\r\n'
+    b'X-Accel-Buffering: no\r\n'
+    b'\r\n'
+)
+
+#: Kopf eines Bildes im MJPEG-Stream (inklusive Boundary), ``%d`` ist die Länge des Bildes.
+FRAME_HEADER = b'--FRAME\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n'
+
+#: Abschluss eines Bildes im MJPEG-Stream.
+_CRLF = memoryview(b'\r\n')
 # --------------------------------------------------------------------------------------------------
 class StreamingOutput:
     """
     File-like-proxy für die Aufnahme des Kamerabildes in einen Buffer
     und signalisierung wartender Threads auf Vorhandensein eines neuen
     Bildes.
+
+    Jeder Client meldet sich mit :meth:`Register` an und erhält ein eigenes Event, das bei
+    jedem neuen Bild gesetzt wird. So muss der Producer keinen gemeinsamen Lock mit allen
+    wartenden Clients teilen.
     """
     def __init__(self):
 
-        #: Enthält den jeweils aktuellen Frame der Kamera nach Benachrichtung der :attr:`condition`.
-        #: Darf nur im Kontext der :attr:`condition` abgefragt werden!
-        self.frame = None
+        #: Tuple aus laufender Nummer (0 = noch kein Bild) und Frame des aktuellen Bildes.
+        #: Wird in :meth:`write` als Ganzes ersetzt und kann deshalb ohne Lock gelesen werden.
+        #: Der Frame ist ein schreibgeschützter ``memoryview`` auf den Buffer des Bildes, den sich
+        #: alle Clients teilen.
+        self.latest = (0, None)
 
         #: Binärer Zwischenbuffer, der die einzelnen Frames der Kamera in :meth:`write` entgegen-
-        #: nimmt. Wenn ein vollständiges Bild empfangen wurde, wird der Frame in :attr:`frame``
-        #: zwischengespeichert und die :attr:`conditon` benachrichtigt.
-        self.buffer = io.BytesIO()
+        #: nimmt. Wenn ein vollständiges Bild empfangen wurde, wird der Buffer selbst (ohne Kopie)
+        #: in :attr:`latest` übergeben, durch einen neuen Buffer ersetzt und die angemeldeten
+        #: Clients benachrichtigt.
+        self.buffer = bytearray()
+
+        #: Events der mit :meth:`Register` angemeldeten Clients. Das Tuple wird bei Änderungen
+        #: als Ganzes ersetzt, :meth:`write` kann es also ohne Lock durchlaufen.
+        self._clients = ()
 
-        #: Condition zu Synchronisierung des Zugriffs auf den :attr:`frame`.
-        self.condition = Condition()
+        #: Anzahl der Bilder, die von Clients übersprungen wurden, weil diese nicht schnell genug
+        #: gesendet haben (siehe :meth:`AddDropped`).
+        self.dropped = 0
+
+        #: Lock für Änderungen an :attr:`_clients` und :attr:`dropped`.
+        self._clients_lock = Lock()
+
+    def Register(self)->Event:
+        """
+        Meldet einen Client für die Benachrichtigung über neue Bilder an.
+        Nach Gebrauch muss das Event mit :meth:`Unregister` wieder abgemeldet werden.
+
+        :returns: Event, das bei jedem neuen Bild gesetzt wird. Ist bereits ein Bild
+            vorhanden, ist das Event sofort gesetzt.
+        """
+        event = Event()
+        if self.latest[0]:
+            event.set()
+        with self._clients_lock:
+            self._clients += (event,)
+        return event
+
+    def Unregister(self, event:Event):
+        """
+        Meldet das mit :meth:`Register` erhaltene ``event`` wieder ab.
+        """
+        with self._clients_lock:
+            self._clients = tuple(e for e in self._clients if e is not event)
+
+    def AddDropped(self, count:int):
+        """
+        Zählt ``count`` von einem Client übersprungene Bilder zu :attr:`dropped` hinzu.
+        """
+        with self._clients_lock:
+            self.dropped += count
+
+    def GetStats(self)->dict:
+        """
+        :returns: Dictionary mit der Anzahl der erzeugten (``frames``) und übersprungenen
+            (``dropped``) Bilder sowie der angemeldeten Clients (``clients``).
+        """
+        return {
+            "frames": self.latest[0],
+            "dropped": self.dropped,
+            "clients": len(self._clients),
+        }
 
     def write(self, buf:bytes)->int:
         """
         Diese Methode nimmt die Binärdaten aus ``buf`` entgegen und
         speichert diese in einem Buffer zwischen. Sobald ein neues Bild beginnt,
-        wird der Inhalt des Buffers in das Attribut :attr:`frame` übertragen und die
-        Condition :attr:`condition` benachrichtigt, so dass alle wartenden Threads nach
-        Erhalt der Benachrichtung das Bild aus :attr:`frame` abrufen können.
-        Der Zugriff auf :attr:`frame` muss immer im Kontext der :attr:`condition` stattfinden!
+        wird der Buffer als :attr:`latest` übergeben und die Events aller angemeldeten
+        Clients (siehe :meth:`Register`) gesetzt, so dass diese nach Erhalt der
+        Benachrichtung das Bild aus :attr:`latest` abrufen können. Ein leerer Buffer (beim
+        ersten Bild) wird nicht übergeben.
 
         :returns: Die Anzahl der in den Buffer übertragenen Bytes.
         """
-        if buf[:2] == b'\xff\xd8':
-            self.buffer.truncate()
-            with self.condition:
-                self.frame = self.buffer.getvalue()
-                self.condition.notify_all()
-            self.buffer.seek(0)
-        return self.buffer.write(buf)
+        if buf[:2] == b'\xff\xd8' and self.buffer:
+            self.latest = (self.latest[0] + 1, memoryview(self.buffer).toreadonly())
+            for event in self._clients:
+                event.set()
+            self.buffer = bytearray()
+        self.buffer += buf
+        return len(buf)
 # --------------------------------------------------------------------------------------------------
 class Camera(LoggableClass):
     """
@@ -184,12 +305,14 @@ class Camera(LoggableClass):
         assert camera.counter == 0
         with camera as output:             # Akquirieren und StreamingOutput holen
             assert camera.counter == 1
-            condition = output.condition   # Condition aus output referenzieren
-            for i in range(10):            # die nächsten 10 Bilder holen
-                with condition:            # Über die condition Sperren
-                    condition.wait()       # Auf den nächsten Frame warten (entsperrt)
-                    frame = output.frame   # Frame holen (im Sperrkontext der condition)
-                pass                       # ab hier ist die Condition wieder ensperrt
+            event = output.Register()      # Für Benachrichtigungen anmelden
+            try:
+                for i in range(10):        # die nächsten 10 Bilder holen
+                    event.wait()           # Auf den nächsten Frame warten
+                    event.clear()
+                    seq, frame = output.latest # Frame holen (ohne Lock)
+            finally:
+                output.Unregister(event)   # Wieder abmelden
         assert camera.counter == 0.0       # ab hier ist die Kamera wieder deaktiviert (da nur
                                            # eine Instanz zugreift)
     """
@@ -238,10 +361,18 @@ class Camera(LoggableClass):
             self.counter += 1
             self.debug("Acquired camera, counter: %d", self.counter)
             if self.counter == 1:
-                self.counter = 1
-                self.camera = PiCamera(resolution = RESOLUTION, framerate = CAM_FRAMERATE)
-                self.output = StreamingOutput()
-                self.camera.start_recording(self.output, format = 'mjpeg')
+                try:
+                    self.camera = PiCamera(resolution = RESOLUTION, framerate = CAM_FRAMERATE)
+                    self.output = StreamingOutput()
+                    self.camera.start_recording(self.output, format = 'mjpeg')
+                except Exception:
+                    # sonst bliebe der Zähler stehen und die Kamera würde nie wieder gestartet
+                    self.counter -= 1
+                    if self.camera is not None:
+                        self.camera.close()
+                    self.camera = None
+                    self.output = None
+                    raise
                 self.debug("Switched camera on.")
             return self.camera
 
@@ -280,13 +411,52 @@ class StreamingHandler(server.BaseHTTPRequestHandler):
     """
     Handler für GET-Requests an den :class:`StreamingServer`.
     """
+    #: Jedes Bild wird mit einem Aufruf geschrieben, deshalb Nagle abschalten (``TCP_NODELAY``).
+    disable_nagle_algorithm = True
+
+    #: Größe des Sendepuffers der Verbindung in Bytes (``SO_SNDBUF``), damit ein Bild bei
+    #: schwankender Bitrate ohne Blockieren an den Kernel übergeben werden kann.
+    send_buffer_size = 256 * 1024
+    # ----------------------------------------------------------------------------------------------
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
     # ----------------------------------------------------------------------------------------------
-    def _GetFrame(self, logger, output):
-        with output.condition:
-            if not output.condition.wait(20.0):
-                logger.warning("Condition not notified in time.")
+    def _GetFrame(self, logger, output, event, last_seq:int = 0)->tuple:
+        """
+        Liefert das aktuelle Bild aus ``output``, sobald dessen Nummer nicht mehr ``last_seq``
+        ist. Gewartet wird am mit :meth:`StreamingOutput.Register` erhaltenen ``event``.
+        Ein langsamer Client wartet also nicht auf das nächste Bild, sondern erhält sofort
+        das neueste und überspringt die dazwischenliegenden.
+
+        :returns: Tuple aus Nummer des Frames und Frame.
+        """
+        while True:
+            if not event.wait(20.0):
+                logger.warning("Frame event not set in time.")
                 raise TimeoutError("Camera timeout.")
-            return output.frame
+            event.clear()
+            seq, frame = output.latest
+            if seq != last_seq:
+                return seq, frame
+    # ----------------------------------------------------------------------------------------------
+    def _SendStreamFrame(self, frame):
+        """
+        Sendet ``frame`` als Teil des MJPEG-Streams. Kopf, Bild und Abschluss werden per
+        ``sendmsg`` gemeinsam übergeben, ohne sie vorher in einen Buffer zu kopieren.
+        """
+        parts = [memoryview(FRAME_HEADER % len(frame)), frame, _CRLF]
+        sendmsg = self.connection.sendmsg
+        while parts:
+            sent = sendmsg(parts)
+            # bereits gesendete Teile entfernen, den Rest ggf. erneut senden
+            while sent:
+                part_len = len(parts[0])
+                if sent < part_len:
+                    parts[0] = parts[0][sent:]
+                    break
+                sent -= part_len
+                del parts[0]
     # ----------------------------------------------------------------------------------------------
     def _SendDefaultHeader(self):
         self.send_response(200)
@@ -310,9 +480,11 @@ class StreamingHandler(server.BaseHTTPRequestHandler):
 
         with camera as output:
             frame = None
+            seq = 0
+            event = output.Register()
             try:
                 while skip_frames:
-                    frame = self._GetFrame(logger, output)
+                    seq, frame = self._GetFrame(logger, output, event, seq)
                     skip_frames -= 1
             except Exception as exc:
                 self.logger.exception("Error while steady image request.")
@@ -324,6 +496,8 @@ class StreamingHandler(server.BaseHTTPRequestHandler):
             else:
                 self._SendDefaultHeader()
                 self._SendSingleFrame(frame)
+            finally:
+                output.Unregister(event)
     # ----------------------------------------------------------------------------------------------
     def StreamRequest(self, logger):
         """
@@ -338,18 +512,31 @@ class StreamingHandler(server.BaseHTTPRequestHandler):
             )
             return
 
-        self._SendDefaultHeader()
-        self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=FRAME')
-        self.end_headers()
+        # vorberechneter Antwortkopf statt send_response / send_header
+        self.log_request(200)
+        self.close_connection = True
+        self.wfile.write(STREAM_PREAMBLE)
 
         try:
-            end_time = time.time() + MAX_STREAM_TIME
+            end_time = time.monotonic() + MAX_STREAM_TIME
             logger.info("Started streaming")
             with camera as output:
-                while end_time > time.time():
-                    frame = self._GetFrame(logger, output)
-                    self.wfile.write(b'--FRAME\r\n')
-                    self._SendSingleFrame(frame)
+                seq = 0
+                sent = dropped = 0
+                event = output.Register()
+                try:
+                    while end_time > time.monotonic():
+                        last_seq = seq
+                        seq, frame = self._GetFrame(logger, output, event, seq)
+                        if last_seq and seq - last_seq > 1:
+                            # Client war zu langsam, dazwischenliegende Bilder übersprungen
+                            dropped += seq - last_seq - 1
+                        self._SendStreamFrame(frame)
+                        sent += 1
+                finally:
+                    output.Unregister(event)
+                    output.AddDropped(dropped)
+                    logger.info("Sent %d frames, dropped %d.", sent, dropped)
             logger.info("Stream reached timeout, stopped.")
             self.wfile.write(b'--FRAME\r\n')
             self.send_error(
@@ -370,6 +557,24 @@ class StreamingHandler(server.BaseHTTPRequestHandler):
         except Exception as e:
             logger.info("Disconnected, stopped streaming (%s).", e)
     # ----------------------------------------------------------------------------------------------
+    def StatsRequest(self, logger):
+        """
+        Ausgabe der Statistik als JSON: Anzahl aktiver Zugriffe auf die Kamera (``streams``)
+        sowie die Werte aus :meth:`StreamingOutput.GetStats` (0, wenn die Kamera aus ist).
+        """
+        output = camera.output
+        stats = output.GetStats() if output is not None else {
+            "frames": 0, "dropped": 0, "clients": 0
+        }
+        stats["streams"] = camera.counter
+        logger.debug("Stats: %r", stats)
+        content = json.dumps(stats).encode('utf-8')
+        self._SendDefaultHeader()
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', len(content))
+        self.end_headers()
+        self.wfile.write(content)
+    # ----------------------------------------------------------------------------------------------
     def do_GET(self):
         """
         Wird gerufen, um ein GET-Request zu behandeln.
@@ -381,39 +586,133 @@ class StreamingHandler(server.BaseHTTPRequestHandler):
             - ``/stream.mjpg``: Ausgabe des Kamerastreams. Siehe den Abschnitt *Restriktionen*
                                 weiter oben.
             - ``/steady.jpg``: Einzelnes Standbild. Hier greifen die Restriktionen nicht.
+            - ``/stats``: Statistik der Kamera als JSON (siehe :meth:`StatsRequest`).
 
         In allen anderen Fällen wird ein 404-Response ausgegeben.
+
+        Die Zuordnung erfolgt über :attr:`_HANDLERS`.
         """
         name = '%s:%s' % self.client_address
         logger = getLogger(name)
         logger.debug("Handling request: %r", self.path)
-        if self.path == '/':
-            # -----[Zugriff auf Basis-URL, hier leiten wir nach /index.html um]-----
-            self.send_response(301)
-            self.send_header('Location', '/index.html')
-            self.end_headers()
-        elif self.path == '/index.html':
-            # -----[Zugriff auf index.html, Ausgabe von PAGE]-----
-            content = PAGE.encode('utf-8')
-            self.send_response(200)
-            self.send_header('Content-Type', 'text/html; charset=utf-8')
-            self.send_header('Content-Length', len(content))
-            self.end_headers()
-            self.wfile.write(content)
-        elif self.path == '/steady.jpg':
-            self.SteadyRequest(logger)
-        elif self.path == '/stream.mjpg':
-            self.StreamRequest(logger)
-        else:
-            self.send_error(404, message = "Invalid path %r" % (self.path,))
-            self.end_headers()
+        self._HANDLERS.get(self.path, StreamingHandler.NotFoundRequest)(self, logger)
+    # ----------------------------------------------------------------------------------------------
+    def RedirectRequest(self, _logger):
+        """
+        Zugriff auf die Basis-URL, hier leiten wir nach ``/index.html`` um.
+        """
+        self.send_response(301)
+        self.send_header('Location', '/index.html')
+        self.end_headers()
+    # ----------------------------------------------------------------------------------------------
+    def PageRequest(self, _logger):
+        """
+        Zugriff auf ``/index.html``, Ausgabe von :data:`PAGE`.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', PAGE_LEN)
+        self.end_headers()
+        self.wfile.write(PAGE_BYTES)
+    # ----------------------------------------------------------------------------------------------
+    def NotFoundRequest(self, _logger):
+        """
+        Zugriff auf einen unbekannten Pfad (404).
+        """
+        self.send_error(404, message = "Invalid path %r" % (self.path,))
+        self.end_headers()
+    # ----------------------------------------------------------------------------------------------
+    #: Zuordnung der Request-Pfade zu den Methoden, die den Request in :meth:`do_GET` behandeln.
+    _HANDLERS = {
+        '/': RedirectRequest,
+        '/index.html': PageRequest,
+        '/steady.jpg': SteadyRequest,
+        '/stream.mjpg': StreamRequest,
+        '/stats': StatsRequest,
+    }
 # --------------------------------------------------------------------------------------------------
-class StreamingServer(socketserver.ThreadingMixIn, server.HTTPServer):
+class StreamingServer(server.HTTPServer):
     """
     Server für threaded HTTP-Requests.
+
+    Statt für jede Verbindung einen neuen Thread zu starten, werden die Requests an einen Pool
+    von höchstens :data:`MAX_WORKERS` Threads übergeben, die bei Bedarf gestartet und dann
+    wiederverwendet werden. Sind alle Threads belegt, wird die Verbindung direkt beim Annehmen
+    mit :data:`_BUSY_RESPONSE` abgewiesen.
     """
     allow_reuse_address = False
-    daemon_threads = True
+
+    #: Länge der Warteschlange des Kernels für noch nicht angenommene Verbindungen (``listen``).
+    #: Klein gehalten, damit Clients bei Überlast schnell abgewiesen werden.
+    request_queue_size = MAX_STREAM_COUNT
+
+    #: Antwort, mit der eine Verbindung abgewiesen wird, wenn kein Thread frei ist.
+    _BUSY_RESPONSE = (
+        b"HTTP/1.0 503 Service Unavailable\r\n"
+        b"Content-Type: text/plain\r\n"
+        b"Content-Length: 13\r\n"
+        b"Connection: close\r\n"
+        b"\r\n"
+        b"Server busy.\n"
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        #: Warteschlange der angenommenen Verbindungen für die Worker-Threads.
+        self._requests = queue.Queue()
+        #: Lock für :attr:`_busy` und :attr:`_workers`.
+        self._workers_lock = Lock()
+        #: Anzahl der übergebenen und noch nicht abgeschlossenen Verbindungen.
+        self._busy = 0
+        #: Die bisher gestarteten Worker-Threads.
+        self._workers = []
+
+    def process_request(self, request, client_address):
+        """
+        Übergibt die Verbindung an einen freien Worker-Thread (und startet bei Bedarf einen
+        neuen). Ist bereits :data:`MAX_WORKERS` erreicht, wird die Verbindung abgewiesen.
+        """
+        with self._workers_lock:
+            accepted = self._busy < MAX_WORKERS
+            if accepted:
+                self._busy += 1
+                if self._busy > len(self._workers):
+                    worker = Thread(
+                        target = self._WorkerLoop,
+                        name = "request-%d" % (len(self._workers),),
+                        daemon = True
+                    )
+                    self._workers.append(worker)
+                    worker.start()
+        if not accepted:
+            # außerhalb des Locks, damit die Worker ihre Verbindungen freigeben können
+            self._RejectRequest(request)
+            return
+        self._requests.put((request, client_address))
+
+    def _RejectRequest(self, request):
+        """
+        Weist die Verbindung mit :attr:`_BUSY_RESPONSE` ab. Gesendet wird nicht blockierend,
+        ein Client, der nicht liest, kann so den annehmenden Thread nicht aufhalten.
+        """
+        try:
+            request.setblocking(False)
+            request.send(self._BUSY_RESPONSE)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def _WorkerLoop(self):
+        while True:
+            request, client_address = self._requests.get()
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                with self._workers_lock:
+                    self._busy -= 1
 # --------------------------------------------------------------------------------------------------
 def Main():
     """
@@ -114,6 +114,15 @@ DOORCHECK_INTERVAL = 60
 #: Intervall in dem die Messergebnisse der Sensoren erfasst werden in Sekunden.
 SENSOR_INTERVALL = 5 * 60
 
+#: Dauer in Sekunden, für die ein Messwert aus :meth:`board.Sensors.ReadChannel`
+#: wiederverwendet wird, bevor der Kanal erneut gelesen wird.
+SENSOR_CACHE_TTL = 0.5
+
+#: Lineare Korrektur des Temperatursensors (Steigung ``m`` und Versatz ``c``), die
+#: gemessene Temperatur ``T_m`` wird zu ``(T_m - c) / m`` korrigiert.
+TEMP_CORRECTION_GAIN = 1.0
+TEMP_CORRECTION_OFFSET = 0.0
+
 #: Dauer in Sekunden die die Türautomatik bei manueller Bedienung deaktiviert
 #: wird.
 DOOR_AUTOMATIC_OFFTIME = 30 * 60
@@ -154,6 +163,25 @@ LOWER_REED_OFFSET = 0.6    #: Dauer in Sekunden die die Tür nach Signalisierung
                            #: damit die Tür vollständig geschlossen ist
 UPPER_REED_OFFSET = 0.6    #: Wie :data:`LOWER_REED_OFFSET` für den oberen
                            #: Magnetkontakt
+REED_POLL_INTERVAL = 0.25  #: Maximaler Abstand in Sekunden zwischen den Einzel-
+                           #: messungen des Magnetkontakts während der Türbewegung
+                           #: (eine fallende Flanke weckt vorher auf)
+REED_POLL_INTERVAL_FINE = 0.05 #: Wie :data:`REED_POLL_INTERVAL`, aber gegen Ende
+                               #: der Türbewegung (siehe :data:`REED_POLL_FINE_RATIO`)
+REED_POLL_FINE_RATIO = 0.7 #: Anteil der maximalen Bewegungszeit, ab dem mit
+                           #: :data:`REED_POLL_INTERVAL_FINE` gemessen wird
+REED_EDGE_TIMEOUT = 0.7    #: Maximale Wartezeit in Sekunden auf eine fallende Flanke
+                           #: in :meth:`board.Board.IsReedClosed`
+REED_CACHE_TTL = 0.25      #: Dauer in Sekunden, für die das Ergebnis von
+                           #: :meth:`board.Board.IsReedClosed` wiederverwendet wird
+# ------------------------------------------------------------------------
+#: Zeit in Sekunden, in der schnell aufeinanderfolgende Statusänderungen des Boards
+#: gesammelt und dann mit einem einzigen Aufruf des Change-Handlers gemeldet werden.
+STATE_COALESCE_TIME = 0.1
+
+#: Dauer in Sekunden, für die das Ergebnis von :meth:`board.Board.GetState` wiederverwendet
+#: wird, solange sich der gespeicherte Zustand des Boards nicht ändert.
+STATE_CACHE_TTL = 0.5
 # ------------------------------------------------------------------------
 #: Gibt an, wieviel Sekunden vor den Schließen der Tür die Innen-
 #: beleuchtung aktiviert werden soll.
@@ -184,6 +212,10 @@ BTN_DURATION_SHUTDOWN = 6.0
 #: um einen Reboot auszulösen.
 #: Achtung: dieser Wert muss KLEINER als BTN_DURATION_SHUTDOWN sein
 BTN_DURATION_REBOOT = 2.0
+
+#: Intervall in Sekunden, in dem nach dem Drücken des Shutdown-Buttons
+#: geprüft wird, ob er wieder losgelassen wurde.
+BTN_POLL_INTERVAL = 0.05
 # ------------------------------------------------------------------------
 #: Dauer in Sekunden, die nach Aktion der Tür gewartet wird, bis die
 #: Nachricht dazu verschickt wird.
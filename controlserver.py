@@ -762,11 +762,13 @@ class Controller(LoggableClass):
 
     def CleanUp(self):
         """
-        Räumt die Instanz auf und hält den :class:`JobTimer` synchron an.
+        Räumt die Instanz auf, hält den :class:`JobTimer` synchron an
+        und gibt das Board frei (siehe :meth:`board.Board.close`).
         """
         self.job_timer.Terminate()
         self.job_timer.Join(6.0)
         self.job_timer = None
+        self.board.close()
 
     def _ReadSensors(self):
         """
@@ -774,8 +776,9 @@ class Controller(LoggableClass):
         hinterlegt die Messergebnisse der angebundenen Sensoren und
         aktualisiert den Board-Status.
         """
-        self.temperature = self.board.GetTemperature()
-        self.light_sensor = self.board.GetLight()
+        values = self.board.GetSensorValues()
+        self.temperature = values["temperature"]
+        self.light_sensor = values["light"]
         self.info(
             "Measured sensors. Light = %d, temperature = %.1f",
             self.light_sensor, self.temperature
@@ -91,6 +91,10 @@ class LoggableClass:
     Also statt ``self.logger.info(..)`` kann dann einfach ``self.info(..)``
     verwendet werden.
     """
+
+    #: Namen der Log-Methoden, die in :meth:`BindLogMethods` an die Instanz gebunden werden.
+    _LOG_METHODS = ('debug', 'info', 'warning', 'warn', 'error', 'exception')
+
     def __init__(self, logger:logging.Logger = None, name:str = None):
         """
         Initialisiert die logbare Instanz.
@@ -105,6 +109,21 @@ class LoggableClass:
         """
         #: Zu verwendende Logger-Instanz. Ist immer gesetzt.
         self.logger = getLogger(name) if logger is None else logger
+        self.BindLogMethods()
+
+    def BindLogMethods(self):
+        """
+        Bindet die Log-Methoden aus :attr:`_LOG_METHODS` direkt an die Instanz, so dass
+        ``self.info(..)`` & Co. nicht bei jedem Aufruf über :meth:`__getattr__` aufgelöst
+        werden müssen. Der Log-Level wird weiterhin bei jedem Aufruf vom :attr:`logger`
+        geprüft, eine spätere Änderung (z.Bsp. ``setLevel(logging.DEBUG)``) wirkt also
+        sofort.
+        """
+        logger = self.logger
+        for name in self._LOG_METHODS:
+            method = getattr(logger, name, None)
+            if method is not None:
+                setattr(self, name, method)
 
     def __getattr__(self, name:str):
         """
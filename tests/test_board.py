@@ -11,6 +11,11 @@ def _SetupPath():
         sys.path.insert(0, root)
 _SetupPath()
 # --------------------------------------------------------------------------------------------------
+import json
+import pathlib
+import tempfile
+import time
+import types
 import unittest
 import base
 import board
@@ -19,6 +24,14 @@ from gpio import GPIO
 # --------------------------------------------------------------------------------------------------
 filestate = dict(saved = False, loaded = False)
 logger = base.logger
+
+#: Die echte Methode :meth:`board.Board.Save`, die Testklassen ersetzen sie durch
+#: :func:`_DummySave`.
+_BoardSave = board.Board.Save
+
+#: Wartezeit auf den Change-Handler: nach STATE_COALESCE_TIME ruft dieser GetState, das die
+#: gespeicherte Türposition über eine Messreihe am Magnetkontakt bestätigt.
+_NOTIFY_WAIT = STATE_COALESCE_TIME + 1.0
 # --------------------------------------------------------------------------------------------------
 def _DummyLoad(*_args, **_kwargs):
     filestate['loaded'] = True
@@ -33,6 +46,174 @@ def _GetSaveState():
     filestate['saved'] = False
     return res
 # --------------------------------------------------------------------------------------------------
+class _ScriptedBus:
+    """
+    I2C-Bus für die Tests von :class:`board.Sensors`. Jeder Aufruf von
+    ``read_i2c_block_data`` liefert das nächste Element aus ``blocks``, ist dieses eine
+    Exception, wird sie geworfen. ``read_byte`` liefert die Werte aus ``single_bytes``.
+    """
+    def __init__(self, blocks = (), single_bytes = ()):
+        self.blocks = list(blocks)
+        self.single_bytes = list(single_bytes)
+        self.calls = []
+
+    def read_i2c_block_data(self, addr, channel, length):
+        self.calls.append(("block", addr, channel, length))
+        block = self.blocks.pop(0)
+        if isinstance(block, Exception):
+            raise block
+        return list(block)
+
+    def write_byte(self, addr, value):
+        self.calls.append(("write", addr, value))
+
+    def read_byte(self, addr):
+        self.calls.append(("byte", addr))
+        return self.single_bytes.pop(0)
+
+    def close(self):
+        self.calls.append(("close",))
+# --------------------------------------------------------------------------------------------------
+class Test_TestSensors(base.TestCase):
+
+    def _Sensors(self, bus, cache_ttl = 10.0):
+        sensors = board.Sensors(bus = bus, cache_ttl = cache_ttl)
+        self.addCleanup(sensors.CleanUp)
+        return sensors
+
+    def test_StableBlockRead(self):
+        channel = board.Sensors.SMBUS_CH_LIGHT
+        bus = _ScriptedBus(blocks = [[99, 20, 21, 20]])
+        sensors = self._Sensors(bus)
+        self.assertEqual(sensors.ReadChannel(channel), 20, "Stale first byte is discarded.")
+        self.assertEqual(
+            bus.calls, [("block", board.Sensors.SMBUS_ADDR, channel, 4)],
+            "Stable head needs a single block read.")
+
+    def test_UnstableBlockRead(self):
+        channel = board.Sensors.SMBUS_CH_TEMP
+        bus = _ScriptedBus(blocks = [[99, 10, 50, 30], [40, 40, 40, 40, 40, 40, 40]])
+        sensors = self._Sensors(bus)
+        self.assertEqual(sensors.ReadChannel(channel), 40, "Median of all values.")
+        self.assertEqual(
+            [call[3] for call in bus.calls], [4, 7], "Rest is read without discarding.")
+
+    def test_BlockReadFallback(self):
+        channel = board.Sensors.SMBUS_CH_LIGHT
+        bus = _ScriptedBus(blocks = [OSError("no block transfer")], single_bytes = [99, 7, 8, 7])
+        sensors = self._Sensors(bus)
+        with self.assertLogs(sensors.logger, "WARNING"):
+            self.assertEqual(sensors.ReadChannel(channel, 3), 7, "Single bytes are read.")
+        self.assertEqual(
+            bus.calls[1], ("write", board.Sensors.SMBUS_ADDR, channel), "Channel is selected.")
+        self.assertEqual(bus.single_bytes, [], "Stale byte and all values have been read.")
+
+    def test_Cache(self):
+        channel = board.Sensors.SMBUS_CH_LIGHT
+        bus = _ScriptedBus(blocks = [[99, 20, 20, 20], [99, 30, 30, 30], [99, 40, 40, 40]])
+        sensors = self._Sensors(bus)
+        self.assertEqual(sensors.ReadChannel(channel), 20, "First value is read.")
+        self.assertEqual(sensors.ReadChannel(channel), 20, "Second value comes from cache.")
+        self.assertEqual(len(bus.calls), 1, "Cached value needs no bus access.")
+        self.assertEqual(sensors.ReadChannel(channel, 5), 30, "Other count is not cached.")
+        sensors.cache_ttl = 0.0
+        self.assertEqual(sensors.ReadChannel(channel), 40, "Expired value is read again.")
+
+    def test_BusClockCheckedOnFirstUse(self):
+        checks = []
+        check = board.Sensors._CheckBusClock
+        board.Sensors._CheckBusClock = lambda sensors: checks.append(sensors)
+        try:
+            sensors = self._Sensors(_ScriptedBus(blocks = [[99, 20, 20, 20]] * 2), 0.0)
+            self.assertEqual(checks, [], "No bus access at construction.")
+            sensors.ReadChannel(board.Sensors.SMBUS_CH_LIGHT)
+            sensors.ReadChannel(board.Sensors.SMBUS_CH_LIGHT)
+        finally:
+            board.Sensors._CheckBusClock = check
+        self.assertEqual(checks, [sensors], "Clock is checked once on first use.")
+
+    def test_ZeroTemperatureGain(self):
+        gain = board.TEMP_CORRECTION_GAIN
+        try:
+            board.TEMP_CORRECTION_GAIN = 1.0
+            expected = board._BuildCelsiusTable() # pylint: disable=W0212
+            board.TEMP_CORRECTION_GAIN = 0
+            with self.assertLogs("Sensors", "ERROR"):
+                table = board._BuildCelsiusTable() # pylint: disable=W0212
+        finally:
+            board.TEMP_CORRECTION_GAIN = gain
+        self.assertEqual(table, expected, "Table is built with a gain of 1.0.")
+
+    def test_InvalidChannel(self):
+        bus = _ScriptedBus()
+        sensors = self._Sensors(bus)
+        with self.assertLogs(sensors.logger, "ERROR"):
+            self.assertEqual(sensors.ReadChannel(board.Sensors.SMBUS_CH_AOUT), None,
+                             "Output channel can not be read.")
+        self.assertEqual(bus.calls, [], "Invalid channel needs no bus access.")
+
+    def test_UnexpectedError(self):
+        bus = _ScriptedBus(blocks = [TypeError("broken bus")])
+        sensors = self._Sensors(bus)
+        with self.assertLogs(sensors.logger, "ERROR") as logs:
+            self.assertEqual(sensors.ReadChannel(board.Sensors.SMBUS_CH_LIGHT), None,
+                             "Unexpected error results in None.")
+        self.assertTrue(logs.records[0].exc_info, "Error is logged with traceback.")
+# --------------------------------------------------------------------------------------------------
+class Test_TestBoardSave(base.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        GPIO.setwarnings(False)
+        board.Board.Load = _DummyLoad
+        board.Board.Save = _DummySave
+
+    def setUp(self):
+        base.SetInitialGPIOState()
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.board = board.Board()
+        self.board.state_file = pathlib.Path(tmp_dir.name) / "board.json"
+        self.board.Save = types.MethodType(_BoardSave, self.board)
+        self.writes = []
+        write_state = self.board._WriteState # pylint: disable=W0212
+        self.board._WriteState = lambda data: self.writes.append(data) or write_state(data)
+
+    def tearDown(self):
+        self.board.close()
+        super().tearDown()
+
+    def _SavedDoorState(self):
+        with self.board.state_file.open('r') as f:
+            return json.load(f)['door_state']
+
+    def test_SaveBurst(self):
+        for state in (DOOR_OPEN, DOOR_CLOSED, DOOR_NOT_MOVING, DOOR_OPEN):
+            self.board.door_state = state
+            self.assertTrue(self.board.Save(), "State is handed over for writing.")
+        self.board.FlushStateChanges()
+        self.assertEqual(self._SavedDoorState(), DOOR_OPEN, "Last state is on disk.")
+        self.assertEqual(
+            list(self.board.state_file.parent.iterdir()), [self.board.state_file],
+            "No temporary file is left.")
+
+        writes = len(self.writes)
+        self.assertTrue(self.board.Save(), "Unchanged state counts as saved.")
+        self.board.FlushStateChanges()
+        self.assertEqual(len(self.writes), writes, "Unchanged state is not written again.")
+
+    def test_SaveSkipsMoving(self):
+        self.board.door_state = DOOR_MOVING_UP
+        self.assertTrue(self.board.Save(), "Moving state counts as saved.")
+        self.board.FlushStateChanges()
+        self.assertFalse(self.board.state_file.exists(), "Moving state is not written.")
+        self.assertEqual(self.writes, [], "Nothing has been written.")
+
+        self.board.door_state = DOOR_OPEN
+        self.board.Save()
+        self.board.FlushStateChanges()
+        self.assertEqual(self._SavedDoorState(), DOOR_OPEN, "End state is written.")
+# --------------------------------------------------------------------------------------------------
 class Test_TestBoard(base.TestCase):
 
     @classmethod
@@ -46,6 +227,10 @@ class Test_TestBoard(base.TestCase):
         filestate.update(saved = False, loaded = False)
         self.board = board.Board()
 
+    def tearDown(self):
+        self.board.close()
+        super().tearDown()
+
     def test_InitialState(self):
         self.assertTrue(filestate['loaded'], "Initial board state has been loaded.")
         self.assertTrue(self.board.IsDoorClosed(), "Initially door should be closed.")
@@ -134,6 +319,79 @@ class Test_TestBoard(base.TestCase):
         )
         self.assertFalse(_GetSaveState(), "Board state not saved when operation fails.")
 
+    def test_DoorStop(self):
+        ftr = base.Future(self.board.OpenDoor)
+        self.assertTrue(ftr.WaitForExectionStart(1.0), "Future starts within time.")
+        with self.assertRaises(TimeoutError):
+            ftr.WaitForResult(0.5)
+        self.board.StopDoor()
+        self.assertFalse(ftr.WaitForResult(1.0), "Stopped door returns within time.")
+        self.assertEqual(self.board.door_state, DOOR_NOT_MOVING, "Door stopped in between.")
+        with GPIO.write_context():
+            self.assertEqual(GPIO.input(MOTOR_ON), RELAIS_OFF, "Motor is off.")
+
+    def test_DoorStopBeforeStart(self):
+        started = []
+        measure = self.board._MeasureReed # pylint: disable=W0212
+        def _MeasureAndStop(pin):
+            # StopDoor trifft während der Messung vor dem Start des Motors ein
+            self.board.StopDoor()
+            return measure(pin)
+        self.board._MeasureReed = _MeasureAndStop # pylint: disable=W0212
+        self.board.StartMotor = started.append
+        self.assertFalse(self.board.OpenDoor(), "Stopped door has not been moved.")
+        self.assertFalse(started, "Motor has not been started.")
+
+    def test_DoorStateByReeds(self):
+        self.board.door_state = DOOR_NOT_MOVING
+        self.assertEqual(self.board.GetState()["door"], DOOR_CLOSED, "Lower reed is closed.")
+        with GPIO.write_context():
+            GPIO.output(REED_UPPER, REED_CLOSED)
+        self.board._reed_cache.clear() # pylint: disable=W0212
+        self.board._state_cache = None # pylint: disable=W0212
+        self.assertEqual(
+            self.board.GetState()["door"], DOOR_NOT_MOVING, "Both reeds closed is an error.")
+
+    def test_DoorMovedByHand(self):
+        self.board.door_state = DOOR_CLOSED
+        self.assertEqual(self.board.GetState()["door"], DOOR_CLOSED, "Stored state confirmed.")
+        with GPIO.write_context():
+            GPIO.output(REED_LOWER, REED_OPENED)
+            GPIO.output(REED_UPPER, REED_CLOSED)
+        self.board._reed_cache.clear() # pylint: disable=W0212
+        self.board._state_cache = None # pylint: disable=W0212
+        self.assertEqual(
+            self.board.GetState()["door"], DOOR_OPEN, "Door opened by hand is detected.")
+        self.assertEqual(self.board.door_state, DOOR_OPEN, "Stored state follows the reeds.")
+        self.assertFalse(self.board.IsDoorClosed(), "Door is no longer closed.")
+
+        ftr = base.Future(self.board.CloseDoor)
+        self.assertTrue(ftr.WaitForExectionStart(1.0), "Future starts within time.")
+        with self.assertRaises(TimeoutError):
+            ftr.WaitForResult(0.5)
+        with GPIO.write_context():
+            GPIO.output(REED_UPPER, REED_OPENED)
+            GPIO.output(REED_LOWER, REED_CLOSED)
+        self.assertTrue(ftr.WaitForResult(1.0 + LOWER_REED_OFFSET), "CloseDoor() succeeded.")
+        self.assertEqual(self.board.door_state, DOOR_CLOSED, "Door has been closed.")
+
+    def test_DoorStateReadsReedsOnce(self):
+        measured = []
+        measure = self.board._MeasureReed # pylint: disable=W0212
+        self.board._MeasureReed = lambda pin: measured.append(pin) or measure(pin)
+        self.board.door_state = DOOR_OPEN
+        self.board._reed_cache.clear() # pylint: disable=W0212
+        # ohne Zwischenspeicher, es zählt nur die Messung innerhalb von GetState
+        ttl = board.REED_CACHE_TTL
+        board.REED_CACHE_TTL = 0.0
+        try:
+            door = self.board.GetState()["door"]
+        finally:
+            board.REED_CACHE_TTL = ttl
+        self.assertEqual(door, DOOR_CLOSED, "Lower reed is closed.")
+        self.assertEqual(
+            sorted(measured), sorted([REED_UPPER, REED_LOWER]), "Each reed is measured once.")
+
     def test_IndoorLight(self):
         # --- Innenbeleuchtung ---
         self.assertFalse(self.board.IsIndoorLightOn(), "Indoor light should be initially off.")
@@ -169,6 +427,57 @@ class Test_TestBoard(base.TestCase):
         self.assertFalse(self.board.IsOutdoorLightOn(), "Outdoor light should be off.")
         with GPIO.write_context():
             self.assertEqual(GPIO.input(LIGHT_OUTDOOR), RELAIS_OFF, "Outdoor light pin is not off.")
+
+    def test_LightUnchanged(self):
+        changes = []
+        self.board.SetStateChangeHandler(changes.append)
+        self.board.SwitchIndoorLight(True)
+        self.board.SwitchIndoorLight(True)
+        time.sleep(_NOTIFY_WAIT)
+        self.assertEqual(len(changes), 1, "Switching to the current state is no change.")
+        self.board.SwitchOutdoorLight(False)
+        time.sleep(_NOTIFY_WAIT)
+        self.assertEqual(len(changes), 1, "Outdoor light is already off.")
+
+    def test_StateChangeCoalesced(self):
+        changes = []
+        self.board.SetStateChangeHandler(changes.append)
+        self.board.SwitchIndoorLight(True)
+        self.board.SwitchOutdoorLight(True)
+        time.sleep(_NOTIFY_WAIT)
+        self.assertEqual(len(changes), 1, "Rapid changes are reported once.")
+        self.assertTrue(changes[0]["indoor_light"], "Indoor light is reported on.")
+        self.assertTrue(changes[0]["outdoor_light"], "Outdoor light is reported on.")
+
+    def test_StateChangeFlushed(self):
+        changes = []
+        self.board.SetStateChangeHandler(changes.append)
+        self.board.SwitchIndoorLight(True)
+        self.board.FlushStateChanges()
+        self.assertEqual(len(changes), 1, "Pending change is reported on flush.")
+        time.sleep(_NOTIFY_WAIT)
+        self.assertEqual(len(changes), 1, "Flushed change is not reported again.")
+
+    def test_ShutdownButton(self):
+        commands = []
+        popen = board.subprocess.Popen
+        board.subprocess.Popen = lambda args, **_kwargs: commands.append(args)
+        try:
+            for duration in (0.3, BTN_DURATION_REBOOT + 0.3):
+                with GPIO.write_context():
+                    GPIO.output(SHUTDOWN_BUTTON, 0)
+                ftr = base.Future(self.board.OnShutdownButtonPressed, SHUTDOWN_BUTTON)
+                # der GPIO-Thread darf nicht blockiert werden
+                ftr.WaitForResult(0.5)
+                self.assertTrue(ftr.HasResult(), "Interrupt method returns immediately.")
+                time.sleep(duration)
+                with GPIO.write_context():
+                    GPIO.output(SHUTDOWN_BUTTON, 1)
+                self.board._button_thread.join(1.0) # pylint: disable=W0212
+        finally:
+            board.subprocess.Popen = popen
+        self.assertEqual(
+            commands, [board._REBOOT_CMD], "Only the long press reboots.") # pylint: disable=W0212
 # --------------------------------------------------------------------------------------------------
 if __name__ == "__main__":
     unittest.main()
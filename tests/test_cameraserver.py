@@ -0,0 +1,138 @@
+#! /usr/bin/python3
+# -*- coding: utf8 -*-
+# --------------------------------------------------------------------------------------------------
+# pylint: disable=C0413, C0111, C0103, W0212
+# --------------------------------------------------------------------------------------------------
+def _SetupPath():
+    import sys
+    import pathlib
+    root = str(pathlib.Path(__file__).parent.parent)
+    if root not in sys.path:
+        sys.path.insert(0, root)
+_SetupPath()
+# --------------------------------------------------------------------------------------------------
+import pathlib
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from http import server
+import base
+import cameraserver
+# --------------------------------------------------------------------------------------------------
+def _WaitFor(condition, timeout:float = 2.0)->bool:
+    end_time = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end_time:
+            return False
+        time.sleep(0.01)
+    return True
+# --------------------------------------------------------------------------------------------------
+class _BlockingHandler(server.BaseHTTPRequestHandler):
+    """
+    Handler, der erst antwortet, wenn :attr:`release` gesetzt wurde.
+    """
+    release = threading.Event()
+
+    def do_GET(self):
+        self.release.wait(5.0)
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *_args): # pylint: disable=W0221
+        pass
+# --------------------------------------------------------------------------------------------------
+class _ShortConnection:
+    """
+    Verbindung, deren ``sendmsg`` jeweils nur so viele Bytes annimmt wie in ``counts``
+    vorgegeben (der letzte Wert gilt für alle weiteren Aufrufe).
+    """
+    def __init__(self, counts):
+        self.counts = list(counts)
+        self.received = bytearray()
+
+    def sendmsg(self, buffers):
+        data = b''.join(bytes(buf) for buf in buffers)
+        count = self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+        self.received += data[:count]
+        return min(count, len(data))
+# --------------------------------------------------------------------------------------------------
+@unittest.skipUnless(hasattr(cameraserver, '_PLACEHOLDER_JPEG'), "picamera is installed")
+class Test_PiCameraMockup(base.TestCase):
+
+    def test_MissingImages(self):
+        resource_path = cameraserver.resource_path
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cameraserver.resource_path = pathlib.Path(tmp_dir)
+            try:
+                with self.assertLogs("PiCamDummy", "WARNING"):
+                    cam = cameraserver.PiCamera()
+            finally:
+                cameraserver.resource_path = resource_path
+            try:
+                self.assertEqual(
+                    cam._frames, [cameraserver._PLACEHOLDER_JPEG], "Placeholder is used.")
+            finally:
+                cam.close()
+# --------------------------------------------------------------------------------------------------
+class Test_StreamingHandler(base.TestCase):
+
+    def test_SendStreamFrameShortWrites(self):
+        frame = memoryview(bytes(range(256)) * 4)
+        header = cameraserver.FRAME_HEADER % len(frame)
+        # kurz im Kopf, über die Grenze Kopf/Bild, im Bild und über die Grenze Bild/Abschluss
+        counts = (len(header) - 3, 5, 1, len(frame) - 4, 2, 1)
+        handler = cameraserver.StreamingHandler.__new__(cameraserver.StreamingHandler)
+        handler.connection = _ShortConnection(counts)
+        handler._SendStreamFrame(frame)
+        self.assertEqual(
+            bytes(handler.connection.received), header + bytes(frame) + b'\r\n',
+            "All parts are sent completely and in order.")
+# --------------------------------------------------------------------------------------------------
+class Test_StreamingServer(base.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        _BlockingHandler.release.clear()
+        self.server = cameraserver.StreamingServer(('127.0.0.1', 0), _BlockingHandler)
+        self.thread = threading.Thread(target = self.server.serve_forever, daemon = True)
+        self.thread.start()
+
+    def tearDown(self):
+        _BlockingHandler.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def _Connect(self)->socket.socket:
+        conn = socket.create_connection(self.server.server_address, timeout = 2.0)
+        conn.sendall(b"GET / HTTP/1.0\r\n\r\n")
+        return conn
+
+    def test_WorkerPool(self):
+        srv = self.server
+        conns = [self._Connect() for _ in range(cameraserver.MAX_WORKERS)]
+        try:
+            self.assertTrue(
+                _WaitFor(lambda: srv._busy == cameraserver.MAX_WORKERS), "All workers are busy.")
+            extra = self._Connect()
+            try:
+                self.assertTrue(
+                    extra.recv(100).startswith(b"HTTP/1.0 503"), "Extra connection is rejected.")
+            finally:
+                extra.close()
+            self.assertEqual(
+                len(srv._workers), cameraserver.MAX_WORKERS, "No more than MAX_WORKERS threads.")
+
+            _BlockingHandler.release.set()
+            for conn in conns:
+                self.assertTrue(conn.recv(100).startswith(b"HTTP/1.0 200"), "Request answered.")
+        finally:
+            for conn in conns:
+                conn.close()
+        self.assertTrue(_WaitFor(lambda: srv._busy == 0), "All workers are free again.")
+# --------------------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    unittest.main()
@@ -37,6 +37,10 @@ class Test_TestController(base.TestCase):
             GPIO.output(REED_UPPER, REED_OPENED) # Kontakt unten geschlossen
         self.controller = controlserver.Controller(start_jobs = False)
 
+    def tearDown(self):
+        self.controller.board.close()
+        super().tearDown()
+
     def test_InitialState(self):
         c = self.controller
         self.assertTrue(c.IsDoorClosed(), "Initially door should be closed.")
@@ -116,6 +120,8 @@ class Test_TestController(base.TestCase):
         with GPIO.write_context():
             GPIO.output(REED_UPPER, REED_CLOSED) # Kontakt oben geschlossen
             GPIO.output(REED_LOWER, REED_OPENED) # Kontakt unten offen
+        # die Messungen aus dem Konstruktor gelten nicht mehr
+        ctrl.board._reed_cache.clear() # pylint: disable=W0212
 
         ftr = base.Future(ctrl.CloseDoor)
         self.assertTrue(ftr.WaitForExectionStart(0.5), "Door close command is running.")
@@ -41,7 +41,7 @@ class ScreenController(LoggableClass):
         self.door_state = DOOR_NOT_MOVING
         self.shutdown = False
         self._needs_update = True
-        self.last_input = time.time()
+        self.last_input = time.monotonic()
         self.condition = Condition()
         self.tft_state = True
         self.light_state_indoor = False
@@ -186,15 +186,15 @@ class ScreenController(LoggableClass):
                     break
                 update = self._needs_update
                 self._needs_update = False
-                if self.last_input + self.SLEEP_TIMEOUT < time.time():
+                if self.last_input + self.SLEEP_TIMEOUT < time.monotonic():
                     self.switchTFT(switch_on = False)
             if not update:
                 # wenn nicht ohnehin eine Aktualisierung anliegt,
                 # führen wir spätestens nach 60s eine durch
-                update = last_screen_update + 60.0 <= time.time()
+                update = last_screen_update + 60.0 <= time.monotonic()
             if update and self.tft_state:
                 self.drawScreen()
-                last_screen_update = time.time()
+                last_screen_update = time.monotonic()
 
     def onTouchEvent(self, channel):
         """
@@ -202,7 +202,7 @@ class ScreenController(LoggableClass):
         """
         # für die "Einschlafzeit" merken wir uns den
         # Zeitpunkt
-        self.last_input = time.time()
+        self.last_input = time.monotonic()
         # wir reagieren nur auf DOWN
         if self.tft.penDown():
             # wenn der Bildschirm aus war, schalten
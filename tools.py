@@ -162,7 +162,7 @@ def _StateChangeHandler(logger, handler:callable, terminate_condition:callable):
     waittime = 30.0
 
     while not terminate_condition():
-        now = time.time()
+        now = time.monotonic()
         logger.debug("Calling WaitForStateChange.")
         try:
             changed, state = proxy.WaitForStateChange(waittime)
@@ -182,7 +182,7 @@ def _StateChangeHandler(logger, handler:callable, terminate_condition:callable):
                 continue
         if terminate_condition():
             break
-        time_left = waittime - (time.time() - now)
+        time_left = waittime - (time.monotonic() - now)
         if time_left < 1.0:
             continue
         logger.debug("Go sleeping for %.2f seconds.", time_left)
@@ -209,8 +209,8 @@ class Watchdog(LoggableClass):
             # jetzt warten wir kurz, damit alle die Chance haben, zu gehen
             if self.processes:
                 self.warn("Waiting for %d process(es) to exit.", len(self.processes))
-                stop_time = time.time() + 5.0
-                while self.processes and (time.time() < stop_time):
+                stop_time = time.monotonic() + 5.0
+                while self.processes and (time.monotonic() < stop_time):
                     for p in self.processes.copy():
                         self._CheckExitCode(p)
                         time.sleep(0.1)